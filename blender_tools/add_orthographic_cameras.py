@@ -2,7 +2,12 @@ import bpy
 import mathutils
 import math
 
-def create_orthographic_camera(name, location, rotation, scale, ortho_scale):
+# Fixed camera rotations (Euler angles in radians) for each standard view
+FRONT_ROTATION = (math.pi / 2, 0, math.pi)
+SIDE_ROTATION = (math.pi / 2, 0, math.pi / 2)
+TOP_ROTATION = (0, 0, math.pi)
+
+def create_orthographic_camera(name, location, rotation, scale, ortho_scale, target_collection):
     """
     Create an orthographic camera with the given parameters.
     
@@ -12,6 +17,7 @@ def create_orthographic_camera(name, location, rotation, scale, ortho_scale):
         rotation: Rotation of the camera in Euler angles (radians)
         scale: Scale of the camera
         ortho_scale: Orthographic scale of the camera
+        target_collection: Collection to link the camera to
     
     Returns:
         The created camera object
@@ -24,8 +30,8 @@ def create_orthographic_camera(name, location, rotation, scale, ortho_scale):
     # Create camera object
     cam_obj = bpy.data.objects.new(name, cam_data)
     
-    # Link camera to scene
-    bpy.context.collection.objects.link(cam_obj)
+    # Link camera to its collection
+    target_collection.objects.link(cam_obj)
     
     # Set camera location, rotation and scale
     cam_obj.location = location
@@ -43,96 +49,101 @@ def setup_cameras_for_bounding_box(bbox, padding=1.2):
         padding: Padding factor for camera distance (default: 1.2)
     """
     # Get bounding box dimensions and center
-    bbox_dimensions = bbox.dimensions
-    bbox_center = bbox.location
+    dim_x, dim_y, dim_z = bbox.dimensions
+    center_x, center_y, center_z = bbox.location
     
     # Calculate camera distance based on the maximum dimension
-    max_dim = max(bbox_dimensions)
+    max_dim = max(dim_x, dim_y, dim_z)
     camera_distance = max_dim * padding
     
+    # Orthographic scales cover the padded extent on both sides of the center
+    ortho_padding = padding * 2
+    
+    # Create a collection for the cameras if it doesn't exist
+    cam_collection_name = f"{bbox.name}_cameras"
+    cam_collection = bpy.data.collections.get(cam_collection_name)
+    if cam_collection is None:
+        cam_collection = bpy.data.collections.new(cam_collection_name)
+        bpy.context.scene.collection.children.link(cam_collection)
+    
     # Front view camera (Y+)
     # For front view, we need to see the X and Z dimensions
-    front_ortho_scale = max(bbox_dimensions.x, bbox_dimensions.z) * padding * 2
-    front_loc = (bbox_center.x, bbox_center.y + camera_distance, bbox_center.z)
-    front_rot = (math.pi/2, 0, math.pi)
+    front_ortho_scale = max(dim_x, dim_z) * ortho_padding
+    front_loc = (center_x, center_y + camera_distance, center_z)
+    front_rot = FRONT_ROTATION
     front_cam = create_orthographic_camera(
         f"{bbox.name}_front_cam",
         front_loc,
         front_rot,
         (1, 1, 1),
-        front_ortho_scale
+        front_ortho_scale,
+        cam_collection
     )
     
     # Side view camera (X+)
     # For side view, we need to see the Y and Z dimensions
-    side_ortho_scale = max(bbox_dimensions.y, bbox_dimensions.z) * padding * 2
-    side_loc = (bbox_center.x + camera_distance, bbox_center.y, bbox_center.z)
-    side_rot = (math.pi/2, 0, math.pi/2)
+    side_ortho_scale = max(dim_y, dim_z) * ortho_padding
+    side_loc = (center_x + camera_distance, center_y, center_z)
+    side_rot = SIDE_ROTATION
     side_cam = create_orthographic_camera(
         f"{bbox.name}_side_cam",
         side_loc,
         side_rot,
         (1, 1, 1),
-        side_ortho_scale
+        side_ortho_scale,
+        cam_collection
     )
     
     # Top view camera (Z+)
     # For top view, we need to see the X and Y dimensions
-    top_ortho_scale = max(bbox_dimensions.x, bbox_dimensions.y) * padding * 2
-    top_loc = (bbox_center.x, bbox_center.y, bbox_center.z + camera_distance)
-    top_rot = (0, 0, math.pi)
+    top_ortho_scale = max(dim_x, dim_y) * ortho_padding
+    top_loc = (center_x, center_y, center_z + camera_distance)
+    top_rot = TOP_ROTATION
     top_cam = create_orthographic_camera(
         f"{bbox.name}_top_cam",
         top_loc,
         top_rot,
         (1, 1, 1),
-        top_ortho_scale
+        top_ortho_scale,
+        cam_collection
     )
     
-    # Create a collection for the cameras if it doesn't exist
-    cam_collection_name = f"{bbox.name}_cameras"
-    if cam_collection_name not in bpy.data.collections:
-        cam_collection = bpy.data.collections.new(cam_collection_name)
-        bpy.context.scene.collection.children.link(cam_collection)
-    else:
-        cam_collection = bpy.data.collections[cam_collection_name]
-    
-    # Move cameras to their collection
-    for cam in [front_cam, side_cam, top_cam]:
-        # Remove from current collection
-        bpy.context.collection.objects.unlink(cam)
-        # Add to camera collection
-        cam_collection.objects.link(cam)
-    
     return front_cam, side_cam, top_cam
 
 def main():
+    collections = bpy.data.collections
+    
     # Check if BoundingBoxes exists
-    if "BoundingBoxes" not in bpy.data.collections:
+    bbox_collection = collections.get("BoundingBoxes")
+    if bbox_collection is None:
         print("Error: BoundingBoxes collection not found")
         return
     
-    bbox_collection = bpy.data.collections["BoundingBoxes"]
-    
     # Create a collection for all cameras
     all_cameras_collection_name = "OrthographicCameras"
-    if all_cameras_collection_name not in bpy.data.collections:
-        all_cameras_collection = bpy.data.collections.new(all_cameras_collection_name)
+    all_cameras_collection = collections.get(all_cameras_collection_name)
+    if all_cameras_collection is None:
+        all_cameras_collection = collections.new(all_cameras_collection_name)
         bpy.context.scene.collection.children.link(all_cameras_collection)
     
+    # Names of the camera collections already linked under the main collection,
+    # kept up to date as we link so we never rescan its children
+    linked_names = {c.name for c in all_cameras_collection.children}
+    
     # Process each bounding box in the collection
     for bbox in bbox_collection.objects:
-        print(f"Setting up cameras for {bbox.name}")
+        bbox_name = bbox.name
+        print(f"Setting up cameras for {bbox_name}")
         front_cam, side_cam, top_cam = setup_cameras_for_bounding_box(bbox)
         
         # Add the camera collection to the main camera collection
-        cam_collection_name = f"{bbox.name}_cameras"
-        if cam_collection_name in bpy.data.collections:
+        cam_collection_name = f"{bbox_name}_cameras"
+        cam_collection = collections.get(cam_collection_name)
+        if cam_collection is not None:
             # Check if already linked
-            if cam_collection_name not in [c.name for c in bpy.data.collections[all_cameras_collection_name].children]:
-                bpy.data.collections[all_cameras_collection_name].children.link(
-                    bpy.data.collections[cam_collection_name]
-                )
+            if cam_collection_name not in linked_names:
+                all_cameras_collection.children.link(cam_collection)
+                linked_names.add(cam_collection_name)
     
     print("Orthographic cameras setup complete!")
 
@@ -1,7 +1,11 @@
 import bpy
 import math
+import numpy as np
 from mathutils import Vector, Quaternion
 
+# Raw enum value of 'BEZIER' for keyframe interpolation, as used by foreach_set
+BEZIER = 2
+
 def create_camera(name, location, rotation, target_collection):
     """Create a camera at the given location with the given rotation."""
     # Create camera data
@@ -23,12 +27,11 @@ def get_axes_objects():
     axes_objects = []
     
     # Find the collection
-    if "Axes and Fiducials" not in bpy.data.collections:
+    collection = bpy.data.collections.get("Axes and Fiducials")
+    if collection is None:
         print("Collection 'Axes and Fiducials' not found")
         return []
     
-    collection = bpy.data.collections["Axes and Fiducials"]
-    
     # Get all objects in the collection that end with "_axes"
     for obj in collection.objects:
         if obj.name.endswith("_axes"):
@@ -36,6 +39,49 @@ def get_axes_objects():
     
     return axes_objects
 
+def get_axes_transforms(axes_objects):
+    """Read the locations and rotations of the axes objects into numpy arrays.
+    
+    Returns:
+        Tuple of (locations, quaternions) with shapes (N, 3) and (N, 4)
+    """
+    num_axes = len(axes_objects)
+    locations = np.empty((num_axes, 3), dtype=np.float32)
+    quaternions = np.empty((num_axes, 4), dtype=np.float32)
+    
+    for i, obj in enumerate(axes_objects):
+        locations[i] = obj.location
+        quaternions[i] = obj.rotation_quaternion
+    
+    return locations, quaternions
+
+def hold_keyframe_values(values):
+    """Repeat each row of values for its arrive/hold keyframe pair and
+    append the first row again to loop back to the start."""
+    return np.concatenate([np.repeat(values, 2, axis=0), values[:1]])
+
+def add_fcurve_keyframes(action, data_path, frames, values):
+    """Create one fcurve per channel of values and fill its keyframes in bulk.
+    
+    Args:
+        action: Action to add the fcurves to
+        data_path: Animated property, e.g. "location"
+        frames: Array of shape (K,) with the frame of each keyframe
+        values: Array of shape (K, C) with one column per channel
+    """
+    num_keys = len(frames)
+    coords = np.empty(num_keys * 2, dtype=np.float32)
+    coords[0::2] = frames
+    interpolation = np.full(num_keys, BEZIER, dtype=np.int32)
+    
+    for index in range(values.shape[1]):
+        coords[1::2] = values[:, index]
+        fcurve = action.fcurves.new(data_path, index=index)
+        fcurve.keyframe_points.add(num_keys)
+        fcurve.keyframe_points.foreach_set("co", coords)
+        fcurve.keyframe_points.foreach_set("interpolation", interpolation)
+        fcurve.update()
+
 def create_camera_animation():
     """Create a camera that animates through all axes objects."""
     # Get all axes objects
@@ -45,24 +91,25 @@ def create_camera_animation():
         print("No axes objects found")
         return
     
-    print(f"Found {len(axes_objects)} axes objects")
+    num_axes = len(axes_objects)
+    print(f"Found {num_axes} axes objects")
+    
+    # Read all axes transforms once instead of per keyframe
+    axes_locations, axes_quaternions = get_axes_transforms(axes_objects)
     
     # Create a new collection for the camera
     camera_collection = bpy.data.collections.new("Camera Animation")
     bpy.context.scene.collection.children.link(camera_collection)
     
-    # Get the first axes object to position the camera
-    first_axes = axes_objects[0]
-    
     # Create the camera with an offset from the axes
     offset_distance = 5.0  # Distance from the axes
     offset_direction = Vector((0, -1, 0.5)).normalized()  # Direction of the offset
     
-    # Create initial camera location with offset
-    camera_location = first_axes.location + offset_direction * offset_distance
+    # Camera locations with offset from every axes
+    camera_locations = axes_locations + np.array(offset_direction * offset_distance, dtype=np.float32)
     
     # Create a camera that looks at the first axes
-    camera = create_camera("Animated_Camera", camera_location, first_axes.rotation_quaternion, camera_collection)
+    camera = create_camera("Animated_Camera", camera_locations[0], axes_quaternions[0], camera_collection)
     
     # Set the camera as the active camera
     bpy.context.scene.camera = camera
@@ -70,80 +117,48 @@ def create_camera_animation():
     # Calculate total animation duration
     frame_per_axis = 30  # Number of frames to stay at each axis
     transition_frames = 40  # Number of frames for transition between axes
-    total_frames = len(axes_objects) * (frame_per_axis + transition_frames)
+    frames_per_stop = frame_per_axis + transition_frames
+    total_frames = num_axes * frames_per_stop
     
     # Set scene frame range
     bpy.context.scene.frame_start = 1
     bpy.context.scene.frame_end = total_frames
     
-    # Create animation
-    current_frame = 1
-    
-    for i, axes in enumerate(axes_objects):
-        # Calculate the camera position with offset from the current axes
-        camera_location = axes.location + offset_direction * offset_distance
-        
-        # Look-at constraint would be ideal, but for simplicity we'll just use the axes rotation
-        # with a slight adjustment to point the camera at the axes
-        camera_rotation = axes.rotation_quaternion.copy()
-        
-        # Insert keyframe for location and rotation
-        camera.location = camera_location
-        camera.keyframe_insert(data_path="location", frame=current_frame)
-        
-        camera.rotation_quaternion = camera_rotation
-        camera.keyframe_insert(data_path="rotation_quaternion", frame=current_frame)
-        
-        # Move to the frame where we start transitioning to the next axes
-        current_frame += frame_per_axis
-        
-        # Insert the same keyframe at this frame to create a hold
-        camera.keyframe_insert(data_path="location", frame=current_frame)
-        camera.keyframe_insert(data_path="rotation_quaternion", frame=current_frame)
-        
-        # Move to the frame where we should be at the next axes
-        current_frame += transition_frames
-        
-        # If this is the last axes, create keyframes to loop back to the first axes
-        if i == len(axes_objects) - 1:
-            first_axes = axes_objects[0]
-            camera_location = first_axes.location + offset_direction * offset_distance
-            camera_rotation = first_axes.rotation_quaternion.copy()
-            
-            camera.location = camera_location
-            camera.keyframe_insert(data_path="location", frame=current_frame)
-            
-            camera.rotation_quaternion = camera_rotation
-            camera.keyframe_insert(data_path="rotation_quaternion", frame=current_frame)
-    
-    # Set interpolation for smoother animation
-    for fcurve in camera.animation_data.action.fcurves:
-        for keyframe_point in fcurve.keyframe_points:
-            keyframe_point.interpolation = 'BEZIER'
+    # Keyframe timeline: arrive at each axes, hold there, then loop back to the first
+    arrival_frames = 1 + np.arange(num_axes) * frames_per_stop
+    frames = np.empty(2 * num_axes + 1, dtype=np.float32)
+    frames[0:-1:2] = arrival_frames
+    frames[1:-1:2] = arrival_frames + frame_per_axis
+    frames[-1] = total_frames + 1
     
     # Create a track-to constraint so the camera always points at the axes
     track_constraint = camera.constraints.new('TRACK_TO')
     empty = bpy.data.objects.new("Camera_Target", None)
     empty.hide_viewport = True
+    empty.location = axes_locations[0]
     camera_collection.objects.link(empty)
     
+    # Keyframe values of every channel in a single pass: camera location (3),
+    # camera rotation (4) and target location (3) side by side
+    # Look-at constraint would be ideal, but for simplicity we'll just use the axes rotation
+    # with a slight adjustment to point the camera at the axes
+    keyframe_values = hold_keyframe_values(
+        np.hstack([camera_locations, axes_quaternions, axes_locations])
+    )
+    
+    # Create the camera and target animations directly on their fcurves
+    camera_action = bpy.data.actions.new("Animated_Camera_Action")
+    camera.animation_data_create()
+    camera.animation_data.action = camera_action
+    
     # Create an animation for the empty to follow the axes
-    current_frame = 1
-    for i, axes in enumerate(axes_objects):
-        empty.location = axes.location
-        empty.keyframe_insert(data_path="location", frame=current_frame)
-        
-        # Hold at current axes
-        current_frame += frame_per_axis
-        empty.keyframe_insert(data_path="location", frame=current_frame)
-        
-        # Move to the next axes
-        current_frame += transition_frames
-        
-        # If this is the last axes, loop back to the first
-        if i == len(axes_objects) - 1:
-            empty.location = axes_objects[0].location
-            empty.keyframe_insert(data_path="location", frame=current_frame)
+    target_action = bpy.data.actions.new("Camera_Target_Action")
+    empty.animation_data_create()
+    empty.animation_data.action = target_action
+    
+    add_fcurve_keyframes(camera_action, "location", frames, keyframe_values[:, 0:3])
+    add_fcurve_keyframes(camera_action, "rotation_quaternion", frames, keyframe_values[:, 3:7])
+    add_fcurve_keyframes(target_action, "location", frames, keyframe_values[:, 7:10])
     
     # Set up the track-to constraint
     track_constraint.target = empty
@@ -151,10 +166,8 @@ def create_camera_animation():
     track_constraint.up_axis = 'UP_Y'
     
     # Set animation to repeat
-    if camera.animation_data and camera.animation_data.action:
-        camera.animation_data.action.use_cyclic = True
-    if empty.animation_data and empty.animation_data.action:
-        empty.animation_data.action.use_cyclic = True
+    camera_action.use_cyclic = True
+    target_action.use_cyclic = True
     
     print("Camera animation created successfully!")
     return camera
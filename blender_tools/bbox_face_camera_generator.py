@@ -1,144 +1,145 @@
 import bpy
 import mathutils
 import math
+import numpy as np
 
-def create_camera_for_face(bbox_obj, face_normal, face_center, face_size, camera_name):
+# Faces of a bounding box as indices into its 8 bound_box corners
+FACE_INDICES = np.array([
+    [0, 1, 2, 3],  # -Z face
+    [4, 5, 6, 7],  # +Z face
+    [0, 1, 5, 4],  # -Y face
+    [2, 3, 7, 6],  # +Y face
+    [0, 3, 7, 4],  # -X face
+    [1, 2, 6, 5]   # +X face
+])
+
+# Local-space normals of the faces above
+FACE_NORMALS = np.array([
+    (0, 0, -1),  # -Z
+    (0, 0, 1),   # +Z
+    (0, -1, 0),  # -Y
+    (0, 1, 0),   # +Y
+    (-1, 0, 0),  # -X
+    (1, 0, 0)    # +X
+], dtype=np.float32)
+
+def create_camera_for_face(camera_name, location, rotation, ortho_scale, target_collection):
     """Create an orthographic camera facing a specific bounding box face"""
     # Create a new camera
     camera_data = bpy.data.cameras.new(camera_name)
     camera_obj = bpy.data.objects.new(camera_name, camera_data)
     
-    # Add to scene
-    bpy.context.collection.objects.link(camera_obj)
+    # Add to the target collection
+    target_collection.objects.link(camera_obj)
     
     # Set to orthographic
     camera_data.type = 'ORTHO'
+    camera_data.ortho_scale = ortho_scale
+    
+    # Place the camera with its precomputed transform
+    camera_obj.location = location
+    camera_obj.rotation_euler = rotation
+    
+    return camera_obj
+
+def get_face_camera_transforms(faces):
+    """Compute the camera transforms for all faces of a bounding box at once
+    
+    Args:
+        faces: Face arrays as returned by get_bbox_faces
     
-    # Calculate orthographic scale based on the face dimensions
+    Returns:
+        Tuple of (locations, rotations, ortho_scales) with one entry per face
+    """
     # We want the camera to capture the entire face
-    max_dimension = max(face_size)
-    camera_data.ortho_scale = max_dimension * 1.05  # Add a small margin
+    max_dimensions = faces['sizes'].max(axis=1)
+    ortho_scales = max_dimensions * 1.05  # Add a small margin
     
-    # Position the camera
-    # Move it away from the face center in the direction of the normal
-    distance = max_dimension  # Distance from face
-    camera_position = face_center + face_normal * distance
-    camera_obj.location = camera_position
+    # Move each camera away from its face center in the direction of the normal,
+    # by the face's largest dimension
+    locations = faces['centers'] + faces['normals'] * max_dimensions[:, None]
     
-    # Point the camera at the face center
-    direction = face_center - camera_position
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    camera_obj.rotation_euler = rot_quat.to_euler()
+    # Point each camera back along its normal, at the face center
+    rotations = [mathutils.Vector(direction).to_track_quat('-Z', 'Y').to_euler()
+                 for direction in -faces['normals']]
     
-    return camera_obj
+    return locations, rotations, ortho_scales
 
 def get_bbox_faces(bbox_obj):
-    """Get the faces of a bounding box object"""
-    # Get the bounding box dimensions and center in world space
-    bbox = bbox_obj.bound_box
-    bbox_corners = [bbox_obj.matrix_world @ mathutils.Vector(corner) for corner in bbox]
-    
-    # Calculate center
-    center = sum((v for v in bbox_corners), mathutils.Vector()) / 8
-    
-    # Calculate face normals and centers
-    faces = []
-    
-    # Define the faces of the bounding box (indices of corners)
-    face_indices = [
-        [0, 1, 2, 3],  # -Z face
-        [4, 5, 6, 7],  # +Z face
-        [0, 1, 5, 4],  # -Y face
-        [2, 3, 7, 6],  # +Y face
-        [0, 3, 7, 4],  # -X face
-        [1, 2, 6, 5]   # +X face
-    ]
+    """Get the faces of a bounding box object
     
-    face_normals = [
-        mathutils.Vector((0, 0, -1)),  # -Z
-        mathutils.Vector((0, 0, 1)),   # +Z
-        mathutils.Vector((0, -1, 0)),  # -Y
-        mathutils.Vector((0, 1, 0)),   # +Y
-        mathutils.Vector((-1, 0, 0)),  # -X
-        mathutils.Vector((1, 0, 0))    # +X
-    ]
+    Returns:
+        Dict of numpy arrays with one row per face: 'centers' (6, 3),
+        'normals' (6, 3) and 'sizes' (6, 2) holding (width, height)
+    """
+    # Get the bounding box corners in world space
+    matrix_world = np.array(bbox_obj.matrix_world, dtype=np.float32)
+    rot_mat = matrix_world[:3, :3]
+    local_corners = np.array(bbox_obj.bound_box, dtype=np.float32)
+    bbox_corners = local_corners @ rot_mat.T + matrix_world[:3, 3]
+    
+    # Gather the 4 corners of every face at once, shape (6, 4, 3)
+    face_corners = bbox_corners[FACE_INDICES]
+    
+    # Calculate face centers
+    centers = face_corners.mean(axis=1)
+    
+    # Calculate width and height of each face
+    widths = np.linalg.norm(face_corners[:, 1] - face_corners[:, 0], axis=1)
+    heights = np.linalg.norm(face_corners[:, 3] - face_corners[:, 0], axis=1)
     
     # Transform normals to world space (only rotation, no translation)
-    rot_mat = bbox_obj.matrix_world.to_3x3()
-    face_normals = [rot_mat @ normal for normal in face_normals]
-    
-    for i, indices in enumerate(face_indices):
-        # Calculate face center
-        face_center = sum((bbox_corners[idx] for idx in indices), mathutils.Vector()) / 4
-        
-        # Calculate face dimensions
-        corners = [bbox_corners[idx] for idx in indices]
-        
-        # Calculate width and height of the face
-        width = (corners[1] - corners[0]).length
-        height = (corners[3] - corners[0]).length
-        
-        faces.append({
-            'center': face_center,
-            'normal': face_normals[i],
-            'size': (width, height)
-        })
-    
-    return faces
+    normals = FACE_NORMALS @ rot_mat.T
+    
+    return {
+        'centers': centers,
+        'normals': normals,
+        'sizes': np.column_stack([widths, heights])
+    }
+
+def create_cameras_for_bbox_batched(bbox_obj, target_collection):
+    """Create an orthographic camera for each face of a bounding box
+    
+    All face geometry and camera transforms are computed up front in numpy,
+    so the per-face work is limited to creating and placing the cameras.
+    
+    Returns:
+        List of the created camera objects
+    """
+    faces = get_bbox_faces(bbox_obj)
+    locations, rotations, ortho_scales = get_face_camera_transforms(faces)
+    bbox_name = bbox_obj.name
+    
+    return [
+        create_camera_for_face(
+            f"{bbox_name}_camera_{j}",
+            locations[j],
+            rotations[j],
+            ortho_scale,
+            target_collection
+        )
+        for j, ortho_scale in enumerate(ortho_scales.tolist())
+    ]
 
 def main():
+    collections = bpy.data.collections
+    
     # Check if BoundingBoxes collection exists
-    if "BoundingBoxes" not in bpy.data.collections:
+    bbox_collection = collections.get("BoundingBoxes")
+    if bbox_collection is None:
         print("Collection 'BoundingBoxes' not found")
         return
     
-    bbox_collection = bpy.data.collections["BoundingBoxes"]
-    
     # Create a new collection for cameras if it doesn't exist
-    if "BBoxCameras" not in bpy.data.collections:
-        camera_collection = bpy.data.collections.new("BBoxCameras")
+    camera_collection = collections.get("BBoxCameras")
+    if camera_collection is None:
+        camera_collection = collections.new("BBoxCameras")
         bpy.context.scene.collection.children.link(camera_collection)
-    else:
-        camera_collection = bpy.data.collections["BBoxCameras"]
-    
-    # Store the original active collection
-    original_collection = bpy.context.view_layer.active_layer_collection.collection
-    
-    # Set the camera collection as active
-    for layer_collection in bpy.context.view_layer.layer_collection.children:
-        if layer_collection.collection == camera_collection:
-            bpy.context.view_layer.active_layer_collection = layer_collection
-            break
     
     # Process each bounding box in the collection
-    for i, bbox_obj in enumerate(bbox_collection.objects):
+    for bbox_obj in bbox_collection.objects:
         print(f"Processing bounding box: {bbox_obj.name}")
-        
-        # Get the faces of the bounding box
-        faces = get_bbox_faces(bbox_obj)
-        
-        # Create a camera for each face
-        for j, face in enumerate(faces):
-            camera_name = f"{bbox_obj.name}_camera_{j}"
-            camera = create_camera_for_face(
-                bbox_obj, 
-                face['normal'], 
-                face['center'], 
-                face['size'], 
-                camera_name
-            )
-            
-            # Move the camera to the camera collection
-            if camera.users_collection:
-                for collection in camera.users_collection:
-                    collection.objects.unlink(camera)
-            camera_collection.objects.link(camera)
-    
-    # Restore the original active collection
-    for layer_collection in bpy.context.view_layer.layer_collection.children:
-        if layer_collection.collection == original_collection:
-            bpy.context.view_layer.active_layer_collection = layer_collection
-            break
+        create_cameras_for_bbox_batched(bbox_obj, camera_collection)
     
     print("Camera generation complete")
 
@@ -1,34 +1,46 @@
 import bpy
 import math
+import numpy as np
+
+# Raw enum value of 'BEZIER' for keyframe interpolation, as used by foreach_set
+BEZIER = 2
 
 def create_animated_camera():
     # Check if BBoxCameras collection exists
-    if "BBoxCameras" not in bpy.data.collections:
+    bbox_cameras_collection = bpy.data.collections.get("BBoxCameras")
+    if bbox_cameras_collection is None:
         print("Error: BBoxCameras collection not found")
         return
     
-    # Get all cameras from the BBoxCameras collection
-    bbox_cameras = []
-    for obj in bpy.data.collections["BBoxCameras"].objects:
-        if obj.type == 'CAMERA':
-            bbox_cameras.append(obj)
+    # Read the transforms of every object in the collection in bulk,
+    # then keep only the cameras
+    source_objects = bbox_cameras_collection.objects
+    num_objects = len(source_objects)
+    all_locations = np.empty(num_objects * 3, dtype=np.float32)
+    all_rotations = np.empty(num_objects * 3, dtype=np.float32)
+    source_objects.foreach_get("location", all_locations)
+    source_objects.foreach_get("rotation_euler", all_rotations)
+    
+    is_camera = np.array([obj.type == 'CAMERA' for obj in source_objects], dtype=bool)
+    locations = all_locations.reshape(-1, 3)[is_camera]
+    rotations = all_rotations.reshape(-1, 3)[is_camera]
+    num_cameras = len(locations)
     
-    if not bbox_cameras:
+    if num_cameras == 0:
         print("Error: No cameras found in BBoxCameras collection")
         return
     
-    print(f"Found {len(bbox_cameras)} cameras in BBoxCameras collection")
+    print(f"Found {num_cameras} cameras in BBoxCameras collection")
     
     # Create a new camera for animation
     animated_cam_data = bpy.data.cameras.new(name="AnimatedCamera")
     animated_cam = bpy.data.objects.new("AnimatedCamera", animated_cam_data)
     
     # Add to scene
-    if "CameraAnimation" not in bpy.data.collections:
+    cam_anim_collection = bpy.data.collections.get("CameraAnimation")
+    if cam_anim_collection is None:
         cam_anim_collection = bpy.data.collections.new("CameraAnimation")
         bpy.context.scene.collection.children.link(cam_anim_collection)
-    else:
-        cam_anim_collection = bpy.data.collections["CameraAnimation"]
     
     cam_anim_collection.objects.link(animated_cam)
     
@@ -38,36 +50,40 @@ def create_animated_camera():
     
     # Calculate total animation length
     frames_per_camera = 30  # Stay on each camera for 1 second (assuming 30fps)
-    total_frames = len(bbox_cameras) * frames_per_camera
+    total_frames = num_cameras * frames_per_camera
     
     # Set scene end frame
     scene.frame_end = total_frames
     
-    # Create keyframes for each camera position
-    for i, camera in enumerate(bbox_cameras):
-        frame = i * frames_per_camera
-        
-        # Go to frame
-        scene.frame_set(frame)
-        
-        # Set animated camera to match the current bbox camera
-        animated_cam.location = camera.location.copy()
-        animated_cam.rotation_euler = camera.rotation_euler.copy()
-        
-        # Set keyframes for location and rotation
-        animated_cam.keyframe_insert(data_path="location", frame=frame)
-        animated_cam.keyframe_insert(data_path="rotation_euler", frame=frame)
+    # Start the animated camera on the first bbox camera
+    animated_cam.location = locations[0]
+    animated_cam.rotation_euler = rotations[0]
+    
+    # Create the action directly instead of inserting keyframes one by one
+    animated_cam.animation_data_create()
+    action = bpy.data.actions.new(name="AnimatedCameraAction")
+    animated_cam.animation_data.action = action
+    
+    # One keyframe per camera, stored as flat (frame, value) pairs
+    frames = np.arange(num_cameras, dtype=np.float32) * frames_per_camera
+    coords = np.empty(num_cameras * 2, dtype=np.float32)
+    coords[0::2] = frames
+    interpolation = np.full(num_cameras, BEZIER, dtype=np.int32)
+    
+    for data_path, values in (("location", locations), ("rotation_euler", rotations)):
+        for axis in range(3):
+            coords[1::2] = values[:, axis]
+            fcurve = action.fcurves.new(data_path, index=axis)
+            fcurve.keyframe_points.add(num_cameras)
+            fcurve.keyframe_points.foreach_set("co", coords)
+            fcurve.keyframe_points.foreach_set("interpolation", interpolation)
+            fcurve.update()
     
     # Make the scene use our animated camera
     scene.camera = animated_cam
     
-    # Set interpolation method to make transitions smoother
-    for fcurve in animated_cam.animation_data.action.fcurves:
-        for kf in fcurve.keyframe_points:
-            kf.interpolation = 'BEZIER'
-    
-    print(f"Created animated camera with {len(bbox_cameras)} positions")
+    print(f"Created animated camera with {num_cameras} positions")
     return animated_cam
 
 if __name__ == "__main__":
-    create_animated_camera() 
\ No newline at end of file
+    create_animated_camera()
\ No newline at end of file
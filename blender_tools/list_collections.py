@@ -1,6 +1,27 @@
 import bpy
-import bmesh
-from mathutils import Vector
+import numpy as np
+from collections import deque
+
+# Which corners of the wireframe box take the max (True) or min (False)
+# coordinate on each axis: bottom face first, then top face
+BBOX_CORNER_IS_MAX = np.array([
+    (False, False, False),
+    (True, False, False),
+    (True, True, False),
+    (False, True, False),
+    (False, False, True),
+    (True, False, True),
+    (True, True, True),
+    (False, True, True),
+])
+
+# Edges of the wireframe box as flattened index pairs into its 8 corners
+# (bottom face, top face, then the vertical edges)
+BBOX_EDGES = np.array([
+    0, 1, 1, 2, 2, 3, 3, 0,
+    4, 5, 5, 6, 6, 7, 7, 4,
+    0, 4, 1, 5, 2, 6, 3, 7,
+], dtype=np.int32)
 
 def list_collections():
     """
@@ -17,62 +38,74 @@ def list_collections():
     # Print the master collection
     print(f"Master Collection: {master_collection.name}")
     
-    # Function to recursively print collections with proper indentation
-    def print_collection_hierarchy(collection, indent=1):
-        for child in collection.children:
-            print("  " * indent + f"├─ {child.name}")
-            create_bounding_box(child)
-            print_collection_hierarchy(child, indent + 1)
-    
-    # Print the hierarchy
-    print_collection_hierarchy(master_collection)
+    # Find the visible meshes of every collection once, up front
+    mesh_cache = get_visible_meshes_by_collection()
+    
+    # Print the hierarchy with proper indentation, walking it depth-first
+    # with an explicit stack; children are pushed in reverse so they pop in order
+    stack = deque((child, 1) for child in reversed(master_collection.children))
+    while stack:
+        collection, indent = stack.pop()
+        print("  " * indent + f"├─ {collection.name}")
+        
+        mesh_objects = mesh_cache.get(collection)
+        if mesh_objects:
+            create_bounding_box(collection, mesh_objects)
+        
+        stack.extend((child, indent + 1) for child in reversed(collection.children))
     
     # Also print a flat list of all collections
     print("\n=== FLAT LIST OF ALL COLLECTIONS ===")
     for collection in bpy.data.collections:
         print(f"- {collection.name}")
 
-def create_bounding_box(collection):
-    """Create a wireframe bounding box around all objects in the collection."""
-    if not collection.objects:
-        return  # Skip empty collections
-    
-    # Calculate bounds
-    min_co = Vector((float('inf'), float('inf'), float('inf')))
-    max_co = Vector((float('-inf'), float('-inf'), float('-inf')))
-    
-    # Check if collection has any visible objects
-    has_visible_objects = False
+def get_visible_meshes_by_collection():
+    """Map each collection to its visible mesh objects.
     
-    for obj in collection.objects:
+    Done in a single pass over bpy.data.objects so that the type and
+    visibility of every object is only checked once.
+    """
+    mesh_cache = {}
+    for obj in bpy.data.objects:
         if obj.type == 'MESH' and not obj.hide_viewport:
-            has_visible_objects = True
-            
-            # Get object's world matrix
-            world_matrix = obj.matrix_world
-            
-            # Get object's bounding box in world space
-            for v in obj.bound_box:
-                world_v = world_matrix @ Vector(v)
-                
-                # Update min and max coordinates
-                min_co.x = min(min_co.x, world_v.x)
-                min_co.y = min(min_co.y, world_v.y)
-                min_co.z = min(min_co.z, world_v.z)
-                
-                max_co.x = max(max_co.x, world_v.x)
-                max_co.y = max(max_co.y, world_v.y)
-                max_co.z = max(max_co.z, world_v.z)
-    
-    if not has_visible_objects:
-        return
+            for collection in obj.users_collection:
+                mesh_cache.setdefault(collection, []).append(obj)
+    return mesh_cache
+
+def create_bounding_box(collection, mesh_objects):
+    """Create a wireframe bounding box around the visible mesh objects of the collection."""
+    if not mesh_objects:
+        return  # Skip collections without visible meshes
+    
+    # Transform the 8 local bound_box corners of every mesh to world space
+    world_corners = np.empty((len(mesh_objects), 8, 3), dtype=np.float32)
+    for i, obj in enumerate(mesh_objects):
+        world_matrix = np.array(obj.matrix_world, dtype=np.float32)
+        local_corners = np.array(obj.bound_box, dtype=np.float32)
+        world_corners[i] = local_corners @ world_matrix[:3, :3].T + world_matrix[:3, 3]
+    
+    # Calculate bounds over all corners at once
+    world_corners = world_corners.reshape(-1, 3)
+    min_co = world_corners.min(axis=0)
+    max_co = world_corners.max(axis=0)
+    
+    # Corner coordinates of the wireframe box
+    bbox_corners = np.where(BBOX_CORNER_IS_MAX, max_co, min_co)
     
     # Create bounding box mesh
     bbox_name = f"BBox_{collection.name}"
+    bbox_obj = bpy.data.objects.get(bbox_name)
+    
+    # Reuse an existing bounding box by moving its corners in place
+    if bbox_obj is not None and bbox_obj.type == 'MESH' and len(bbox_obj.data.vertices) == 8:
+        bbox_obj.data.vertices.foreach_set("co", bbox_corners.ravel())
+        bbox_obj.data.update()
+        print(f"  Updated bounding box for collection: {collection.name}")
+        return
     
-    # Remove existing bounding box if it exists
-    if bbox_name in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[bbox_name])
+    # Remove anything else using the name so the new box keeps it
+    if bbox_obj is not None:
+        bpy.data.objects.remove(bbox_obj)
     
     # Create new mesh and object
     mesh = bpy.data.meshes.new(bbox_name)
@@ -81,50 +114,25 @@ def create_bounding_box(collection):
     # Link to scene
     bpy.context.scene.collection.objects.link(bbox_obj)
     
-    # Create bmesh
-    bm = bmesh.new()
-    
-    # Create vertices
-    v1 = bm.verts.new((min_co.x, min_co.y, min_co.z))
-    v2 = bm.verts.new((max_co.x, min_co.y, min_co.z))
-    v3 = bm.verts.new((max_co.x, max_co.y, min_co.z))
-    v4 = bm.verts.new((min_co.x, max_co.y, min_co.z))
-    v5 = bm.verts.new((min_co.x, min_co.y, max_co.z))
-    v6 = bm.verts.new((max_co.x, min_co.y, max_co.z))
-    v7 = bm.verts.new((max_co.x, max_co.y, max_co.z))
-    v8 = bm.verts.new((min_co.x, max_co.y, max_co.z))
-    
-    # Create edges
-    bm.edges.new((v1, v2))
-    bm.edges.new((v2, v3))
-    bm.edges.new((v3, v4))
-    bm.edges.new((v4, v1))
-    
-    bm.edges.new((v5, v6))
-    bm.edges.new((v6, v7))
-    bm.edges.new((v7, v8))
-    bm.edges.new((v8, v5))
-    
-    bm.edges.new((v1, v5))
-    bm.edges.new((v2, v6))
-    bm.edges.new((v3, v7))
-    bm.edges.new((v4, v8))
-    
-    # Update mesh
-    bm.to_mesh(mesh)
-    bm.free()
+    # Fill the wireframe's vertices and edges in bulk
+    mesh.vertices.add(8)
+    mesh.vertices.foreach_set("co", bbox_corners.ravel())
+    mesh.edges.add(12)
+    mesh.edges.foreach_set("vertices", BBOX_EDGES)
+    mesh.update()
     
     # Set display properties
     bbox_obj.display_type = 'WIRE'
     bbox_obj.show_in_front = True
     
     # Create a material for the bounding box
-    if f"BBox_Material_{collection.name}" not in bpy.data.materials:
-        mat = bpy.data.materials.new(f"BBox_Material_{collection.name}")
+    mat_name = f"BBox_Material_{collection.name}"
+    mat = bpy.data.materials.get(mat_name)
+    if mat is None:
+        mat = bpy.data.materials.new(mat_name)
         mat.diffuse_color = (1.0, 0.0, 0.0, 1.0)  # Red color
-        bbox_obj.data.materials.append(mat)
-    else:
-        bbox_obj.data.materials.append(bpy.data.materials[f"BBox_Material_{collection.name}"])
+    if mat.name not in mesh.materials:
+        mesh.materials.append(mat)
     
     print(f"  Created bounding box for collection: {collection.name}")
 
@@ -1,7 +1,47 @@
 import bpy
-import bmesh
+import sys
+import zlib
+import numpy as np
 from mathutils import Vector
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Labels for a hidden flag, indexed by the flag itself
+YES_NO = ("Yes", "No")
+
+# Decimal places orthographic scales are rounded to before sharing camera data
+ORTHO_SCALE_DECIMALS = 4
+
+# Name of the wireframe unit cube mesh shared by all bounding boxes
+UNIT_CUBE_MESH_NAME = "BBox_UnitCube"
+
+# Corners of the unit cube centered on the origin: bottom face first, then top face
+UNIT_CUBE_VERTS = [
+    (-0.5, -0.5, -0.5),
+    (0.5, -0.5, -0.5),
+    (0.5, 0.5, -0.5),
+    (-0.5, 0.5, -0.5),
+    (-0.5, -0.5, 0.5),
+    (0.5, -0.5, 0.5),
+    (0.5, 0.5, 0.5),
+    (-0.5, 0.5, 0.5),
+]
+
+# Edges of the wireframe box as index pairs into its 8 corners
+# (bottom face, top face, then the vertical edges)
+BBOX_EDGES = [
+    (0, 1), (1, 2), (2, 3), (3, 0),
+    (4, 5), (5, 6), (6, 7), (7, 4),
+    (0, 4), (1, 5), (2, 6), (3, 7),
+]
+
+# Fewest collection rows for segment_bounds to beat np.fmin.reduceat,
+# given the cost of compiling it and starting its parallel region
+NUMBA_MIN_ROWS = 1_000_000
+
 def list_collections_detailed():
     """
     List all collections in the current Blender scene with detailed information,
@@ -15,191 +55,266 @@ def list_collections_detailed():
     # Get the master collection
     master_collection = scene.collection
     
+    collections = bpy.data.collections
+    
     # Create or get the visualization collection
-    if "Collection_Visualization" not in bpy.data.collections:
-        viz_collection = bpy.data.collections.new("Collection_Visualization")
-        bpy.context.scene.collection.children.link(viz_collection)
-    else:
-        viz_collection = bpy.data.collections["Collection_Visualization"]
+    viz_collection = collections.get("Collection_Visualization")
+    if viz_collection is None:
+        viz_collection = collections.new("Collection_Visualization")
+        master_collection.children.link(viz_collection)
     
     # Create or get the bounding boxes collection
-    if "BoundingBoxes" not in bpy.data.collections:
-        bbox_collection = bpy.data.collections.new("BoundingBoxes")
+    bbox_collection = collections.get("BoundingBoxes")
+    if bbox_collection is None:
+        bbox_collection = collections.new("BoundingBoxes")
         viz_collection.children.link(bbox_collection)
-    else:
-        bbox_collection = bpy.data.collections["BoundingBoxes"]
     
     # Create or get the cameras collection
-    if "OrthoCameras" not in bpy.data.collections:
-        camera_collection = bpy.data.collections.new("OrthoCameras")
+    camera_collection = collections.get("OrthoCameras")
+    if camera_collection is None:
+        camera_collection = collections.new("OrthoCameras")
         viz_collection.children.link(camera_collection)
-    else:
-        camera_collection = bpy.data.collections["OrthoCameras"]
     
-    # Function to recursively print collections with details
-    def print_collection_details(collection, indent=0):
+    # Transform the bounds of every visible mesh in the scene once, up front
+    world_corners, collection_rows = get_world_bound_corners(scene)
+    
+    # Walk the hierarchy depth-first with an explicit stack; children are
+    # pushed in reverse so they pop in order
+    ordered = []
+    stack = [(master_collection, 0)]
+    while stack:
+        collection, indent = stack.pop()
+        ordered.append((collection, indent))
+        stack.extend((child, indent + 1) for child in reversed(collection.children))
+    
+    # Compute the bounds of every collection before touching bpy.data
+    collection_bounds = get_collections_bounds([collection for collection, _ in ordered],
+                                               world_corners, collection_rows)
+    
+    # Gather the hierarchy details and print them in one write
+    lines = []
+    for collection, indent in ordered:
         prefix = "  " * indent
-        print(f"{prefix}Collection: {collection.name}")
-        print(f"{prefix}  - Objects: {len(collection.objects)}")
-        print(f"{prefix}  - Visible: {'Yes' if not collection.hide_viewport else 'No'}")
-        print(f"{prefix}  - Renderable: {'Yes' if not collection.hide_render else 'No'}")
-        
-        # Create bounding box and cameras for this collection
-        bbox_obj = create_bounding_box(collection, bbox_collection)
-        
-        # If a bounding box was created, add cameras
-        if bbox_obj:
-            create_orthographic_cameras(collection, bbox_obj, camera_collection)
+        collection_objects = collection.objects
+        lines.append(f"{prefix}Collection: {collection.name}")
+        lines.append(f"{prefix}  - Objects: {len(collection_objects)}")
+        lines.append(f"{prefix}  - Visible: {YES_NO[collection.hide_viewport]}")
+        lines.append(f"{prefix}  - Renderable: {YES_NO[collection.hide_render]}")
         
         # List objects in this collection
-        if len(collection.objects) > 0:
-            print(f"{prefix}  - Object list:")
-            for obj in collection.objects:
-                print(f"{prefix}    • {obj.name} ({obj.type})")
+        if len(collection_objects) > 0:
+            lines.append(f"{prefix}  - Object list:")
+            lines.extend(f"{prefix}    • {obj.name} ({obj.type})" for obj in collection_objects)
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    # Create bounding boxes and cameras in one pass over the precomputed bounds
+    for (collection, _), bounds in zip(ordered, collection_bounds):
+        if bounds is None:
+            continue
         
-        # Process child collections
-        for child in collection.children:
-            print_collection_details(child, indent + 1)
+        bbox_obj = create_bounding_box(collection, bbox_collection, *bounds)
+        create_orthographic_cameras(collection, bbox_obj, camera_collection)
     
-    # Print the hierarchy with details
-    print_collection_details(master_collection)
+    # Evaluate all the new and moved objects with a single depsgraph update
+    bpy.context.view_layer.update()
 
-def create_bounding_box(collection, bbox_collection):
-    """Create a wireframe bounding box around all objects in the collection."""
-    if not collection.objects:
-        return None  # Skip empty collections
-    
-    # Calculate bounds
-    min_co = Vector((float('inf'), float('inf'), float('inf')))
-    max_co = Vector((float('-inf'), float('-inf'), float('-inf')))
-    
-    # Check if collection has any visible objects
-    has_visible_objects = False
-    
-    for obj in collection.objects:
-        if obj.type == 'MESH' and not obj.hide_viewport:
-            has_visible_objects = True
-            
-            # Get object's world matrix
-            world_matrix = obj.matrix_world
-            
-            # Get object's bounding box in world space
-            for v in obj.bound_box:
-                world_v = world_matrix @ Vector(v)
-                
-                # Update min and max coordinates
-                min_co.x = min(min_co.x, world_v.x)
-                min_co.y = min(min_co.y, world_v.y)
-                min_co.z = min(min_co.z, world_v.z)
-                
-                max_co.x = max(max_co.x, world_v.x)
-                max_co.y = max(max_co.y, world_v.y)
-                max_co.z = max(max_co.z, world_v.z)
-    
-    if not has_visible_objects:
-        return None
-    
-    # Create bounding box mesh
-    bbox_name = f"BBox_{collection.name}"
-    
-    # Remove existing bounding box if it exists
-    if bbox_name in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[bbox_name])
-    
-    # Create new mesh and object
-    mesh = bpy.data.meshes.new(bbox_name)
-    bbox_obj = bpy.data.objects.new(bbox_name, mesh)
-    
-    # Link to scene and then to the bounding box collection
-    bpy.context.scene.collection.objects.link(bbox_obj)
-    bpy.context.scene.collection.objects.unlink(bbox_obj)
-    bbox_collection.objects.link(bbox_obj)
+def get_world_bound_corners(scene):
+    """Get the world-space bound_box corners of all visible meshes in the scene.
+    
+    Every object is read exactly once, no matter how many collections it
+    belongs to, and all corners are transformed in a single batch.
+    
+    Returns:
+        Tuple of (world_corners, collection_rows) where world_corners has shape
+        (N, 8, 3) and collection_rows maps each collection to the rows of its
+        visible meshes
+    """
+    objects = scene.objects
+    num_objects = len(objects)
+    
+    # Read the matrices and local bounds of all objects in bulk; matrices come
+    # out column-major, so transpose them to the usual row-major layout
+    matrices = np.empty(num_objects * 16, dtype=np.float32)
+    objects.foreach_get("matrix_world", matrices)
+    matrices = matrices.reshape(-1, 4, 4).transpose(0, 2, 1)
+    corners = np.empty(num_objects * 24, dtype=np.float32)
+    objects.foreach_get("bound_box", corners)
+    corners = corners.reshape(-1, 8, 3)
+    
+    # Keep only the visible meshes; type has no bulk accessor, visibility does
+    hidden = np.empty(num_objects, dtype=bool)
+    objects.foreach_get("hide_viewport", hidden)
+    is_mesh = np.array([obj.type == 'MESH' for obj in objects], dtype=bool)
+    mesh_indices = np.flatnonzero(is_mesh & ~hidden)
+    matrices = matrices[mesh_indices]
+    corners = corners[mesh_indices]
+    
+    # Map each collection to the rows of its visible meshes in a single pass
+    collection_rows = {}
+    for row, i in enumerate(mesh_indices.tolist()):
+        for collection in objects[i].users_collection:
+            collection_rows.setdefault(collection, []).append(row)
+    collection_rows = {collection: np.asarray(rows, dtype=np.int32)
+                       for collection, rows in collection_rows.items()}
+    
+    # Rotate/scale then translate the corners of all objects at once
+    world_corners = np.einsum('nij,nkj->nki', matrices[:, :3, :3], corners)
+    world_corners += matrices[:, None, :3, 3]
+    
+    return world_corners, collection_rows
+
+def get_collections_bounds(collections, world_corners, collection_rows):
+    """Get the world-space (min, max) of the visible meshes directly in each collection.
+    
+    The rows of all collections are laid out back to back and reduced segment
+    by segment in one call, so the cost does not grow with per-collection
+    numpy dispatch. Very large scenes use a parallel numba kernel when numba
+    is available.
     
-    # Create bmesh
-    bm = bmesh.new()
-    
-    # Create vertices
-    v1 = bm.verts.new((min_co.x, min_co.y, min_co.z))
-    v2 = bm.verts.new((max_co.x, min_co.y, min_co.z))
-    v3 = bm.verts.new((max_co.x, max_co.y, min_co.z))
-    v4 = bm.verts.new((min_co.x, max_co.y, min_co.z))
-    v5 = bm.verts.new((min_co.x, min_co.y, max_co.z))
-    v6 = bm.verts.new((max_co.x, min_co.y, max_co.z))
-    v7 = bm.verts.new((max_co.x, max_co.y, max_co.z))
-    v8 = bm.verts.new((min_co.x, max_co.y, max_co.z))
-    
-    # Create edges
-    bm.edges.new((v1, v2))
-    bm.edges.new((v2, v3))
-    bm.edges.new((v3, v4))
-    bm.edges.new((v4, v1))
-    
-    bm.edges.new((v5, v6))
-    bm.edges.new((v6, v7))
-    bm.edges.new((v7, v8))
-    bm.edges.new((v8, v5))
-    
-    bm.edges.new((v1, v5))
-    bm.edges.new((v2, v6))
-    bm.edges.new((v3, v7))
-    bm.edges.new((v4, v8))
-    
-    # Update mesh
-    bm.to_mesh(mesh)
-    bm.free()
+    Returns:
+        List with a tuple of (min_co, max_co) Vectors per collection, or None
+        for collections without visible meshes
+    """
+    with_rows = [collection for collection in collections if collection in collection_rows]
+    if not with_rows:
+        return [None] * len(collections)
+    
+    # Reduce each object's 8 corners first; collection bounds combine those
+    object_min = np.fmin.reduce(world_corners, axis=1)
+    object_max = np.fmax.reduce(world_corners, axis=1)
+    
+    # Segment layout: the rows of collection k are rows[offsets[k]:offsets[k] + counts[k]]
+    segments = [collection_rows[collection] for collection in with_rows]
+    counts = np.array([len(segment) for segment in segments], dtype=np.int64)
+    offsets = np.zeros(len(segments), dtype=np.int64)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    rows = np.concatenate(segments)
+    
+    if segment_bounds is not None and len(rows) >= NUMBA_MIN_ROWS:
+        min_cos, max_cos = segment_bounds(object_min, object_max, rows, offsets, counts)
+    else:
+        min_cos = np.fmin.reduceat(object_min[rows], offsets)
+        max_cos = np.fmax.reduceat(object_max[rows], offsets)
+    
+    bounds = {collection: (Vector(min_co), Vector(max_co))
+              for collection, min_co, max_co in zip(with_rows, min_cos, max_cos)}
+    return [bounds.get(collection) for collection in collections]
+
+if numba is not None:
+    @numba.njit(parallel=True)
+    def segment_bounds(object_min, object_max, rows, offsets, counts):
+        """Reduce the object bounds of every row segment to one (min, max) pair.
+        
+        NaN bounds are skipped like np.fmin/np.fmax do, so both paths agree.
+        """
+        num_segments = len(offsets)
+        min_cos = np.empty((num_segments, 3), dtype=object_min.dtype)
+        max_cos = np.empty((num_segments, 3), dtype=object_max.dtype)
+        
+        # Every segment is written by a single thread, so no atomics are needed
+        for k in numba.prange(num_segments):
+            start = offsets[k]
+            min_cos[k] = object_min[rows[start]]
+            max_cos[k] = object_max[rows[start]]
+            for j in range(start + 1, start + counts[k]):
+                row = rows[j]
+                for d in range(3):
+                    # Comparisons with NaN are false, so a NaN running value is replaced
+                    if not object_min[row, d] >= min_cos[k, d]:
+                        if not np.isnan(object_min[row, d]):
+                            min_cos[k, d] = object_min[row, d]
+                    if not object_max[row, d] <= max_cos[k, d]:
+                        if not np.isnan(object_max[row, d]):
+                            max_cos[k, d] = object_max[row, d]
+        
+        return min_cos, max_cos
+else:
+    segment_bounds = None
+
+def get_unit_cube_mesh():
+    """Get the wireframe unit cube mesh shared by all bounding boxes, creating it if needed."""
+    mesh = bpy.data.meshes.get(UNIT_CUBE_MESH_NAME)
+    if mesh is None:
+        mesh = bpy.data.meshes.new(UNIT_CUBE_MESH_NAME)
+        mesh.from_pydata(UNIT_CUBE_VERTS, BBOX_EDGES, [])
+        mesh.update()
+    
+    # Give the mesh a single material slot for the objects to fill in
+    if not mesh.materials:
+        mesh.materials.append(None)
+    
+    return mesh
+
+def create_bounding_box(collection, bbox_collection, min_co, max_co):
+    """Create a wireframe bounding box from min_co to max_co for the collection."""
+    data_objects = bpy.data.objects
+    collection_name = collection.name
+    
+    bbox_name = f"BBox_{collection_name}"
+    
+    unit_cube_mesh = get_unit_cube_mesh()
+    bbox_obj = data_objects.get(bbox_name)
+    
+    # Reuse an existing bounding box by moving and resizing it in place
+    if bbox_obj is not None and bbox_obj.data == unit_cube_mesh:
+        bbox_obj.location = (min_co + max_co) / 2
+        bbox_obj.scale = max_co - min_co
+        bbox_obj["bounds"] = (*min_co, *max_co)
+        print(f"  Updated bounding box for collection: {collection_name}")
+        return bbox_obj
+    
+    # Remove anything else using the name so the new box keeps it
+    if bbox_obj is not None:
+        data_objects.remove(bbox_obj)
+    
+    # Create a new object sharing the unit cube mesh, placed and sized to the bounds
+    bbox_obj = data_objects.new(bbox_name, unit_cube_mesh)
+    bbox_obj.location = (min_co + max_co) / 2
+    bbox_obj.scale = max_co - min_co
+    
+    # Link straight to the bounding box collection
+    bbox_collection.objects.link(bbox_obj)
     
     # Set display properties
     bbox_obj.display_type = 'WIRE'
     bbox_obj.show_in_front = True
     
     # Create a material for the bounding box with a unique color based on collection name
-    if f"BBox_Material_{collection.name}" not in bpy.data.materials:
-        mat = bpy.data.materials.new(f"BBox_Material_{collection.name}")
+    data_materials = bpy.data.materials
+    mat_name = f"BBox_Material_{collection_name}"
+    mat = data_materials.get(mat_name)
+    if mat is None:
+        mat = data_materials.new(mat_name)
         
-        # Generate a unique color based on collection name hash
-        import hashlib
-        hash_val = int(hashlib.md5(collection.name.encode()).hexdigest(), 16)
-        r = ((hash_val & 0xFF0000) >> 16) / 255.0
-        g = ((hash_val & 0x00FF00) >> 8) / 255.0
-        b = (hash_val & 0x0000FF) / 255.0
+        # Generate a unique color based on a CRC32 of the collection name
+        hash_val = zlib.crc32(collection_name.encode())
+        r = ((hash_val >> 16) & 0xFF) / 255.0
+        g = ((hash_val >> 8) & 0xFF) / 255.0
+        b = (hash_val & 0xFF) / 255.0
         
         mat.diffuse_color = (r, g, b, 1.0)
-        bbox_obj.data.materials.append(mat)
-    else:
-        bbox_obj.data.materials.append(bpy.data.materials[f"BBox_Material_{collection.name}"])
-    
-    # Store the bounding box dimensions as custom properties
-    bbox_obj["min_x"] = min_co.x
-    bbox_obj["min_y"] = min_co.y
-    bbox_obj["min_z"] = min_co.z
-    bbox_obj["max_x"] = max_co.x
-    bbox_obj["max_y"] = max_co.y
-    bbox_obj["max_z"] = max_co.z
-    bbox_obj["center_x"] = (min_co.x + max_co.x) / 2
-    bbox_obj["center_y"] = (min_co.y + max_co.y) / 2
-    bbox_obj["center_z"] = (min_co.z + max_co.z) / 2
-    bbox_obj["width"] = max_co.x - min_co.x
-    bbox_obj["height"] = max_co.y - min_co.y
-    bbox_obj["depth"] = max_co.z - min_co.z
-    
-    print(f"  Created bounding box for collection: {collection.name}")
+    
+    # The mesh is shared, so assign the material on the object's slot
+    material_slot = bbox_obj.material_slots[0]
+    material_slot.link = 'OBJECT'
+    material_slot.material = mat
+    
+    # Store the bounds as a single custom property; center and size derive from it
+    bbox_obj["bounds"] = (*min_co, *max_co)
+    
+    print(f"  Created bounding box for collection: {collection_name}")
     return bbox_obj
 
 def create_orthographic_cameras(collection, bbox_obj, camera_collection):
     """Create orthographic cameras for X, Y, and Z views of the bounding box."""
     # Get bounding box dimensions
-    min_x = bbox_obj["min_x"]
-    min_y = bbox_obj["min_y"]
-    min_z = bbox_obj["min_z"]
-    max_x = bbox_obj["max_x"]
-    max_y = bbox_obj["max_y"]
-    max_z = bbox_obj["max_z"]
-    center_x = bbox_obj["center_x"]
-    center_y = bbox_obj["center_y"]
-    center_z = bbox_obj["center_z"]
-    width = bbox_obj["width"]
-    height = bbox_obj["height"]
-    depth = bbox_obj["depth"]
+    min_x, min_y, min_z, max_x, max_y, max_z = bbox_obj["bounds"]
+    center_x = (min_x + max_x) / 2
+    center_y = (min_y + max_y) / 2
+    center_z = (min_z + max_z) / 2
+    width = max_x - min_x
+    height = max_y - min_y
+    depth = max_z - min_z
     
     # Calculate camera distance (add some padding)
     padding = 1.2  # 20% padding
@@ -207,9 +322,8 @@ def create_orthographic_cameras(collection, bbox_obj, camera_collection):
     
     # Create a collection for this collection's cameras
     camera_group_name = f"Cameras_{collection.name}"
-    if camera_group_name in bpy.data.collections:
-        camera_group = bpy.data.collections[camera_group_name]
-    else:
+    camera_group = bpy.data.collections.get(camera_group_name)
+    if camera_group is None:
         camera_group = bpy.data.collections.new(camera_group_name)
         camera_collection.children.link(camera_group)
     
@@ -242,19 +356,35 @@ def create_orthographic_cameras(collection, bbox_obj, camera_collection):
     
     print(f"  Created orthographic cameras for collection: {collection.name}")
 
+def get_ortho_camera_data(ortho_scale):
+    """Get the orthographic camera data for the given scale, creating it if needed.
+    
+    Scales are rounded to ORTHO_SCALE_DECIMALS so that cameras of similarly
+    sized collections share one datablock.
+    """
+    ortho_scale = round(ortho_scale, ORTHO_SCALE_DECIMALS)
+    cam_data_name = f"OrthoCamera_{ortho_scale}"
+    cam_data = bpy.data.cameras.get(cam_data_name)
+    if cam_data is None:
+        cam_data = bpy.data.cameras.new(cam_data_name)
+        cam_data.type = 'ORTHO'  # Set to orthographic
+        cam_data.ortho_scale = ortho_scale  # Set the orthographic scale
+    return cam_data
+
 def create_camera(name, location, target, ortho_scale, collection):
     """Create an orthographic camera at the specified location, looking at the target."""
+    data_objects = bpy.data.objects
+    
     # Remove existing camera if it exists
-    if name in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[name])
+    existing = data_objects.get(name)
+    if existing is not None:
+        data_objects.remove(existing)
     
-    # Create camera data
-    cam_data = bpy.data.cameras.new(name)
-    cam_data.type = 'ORTHO'  # Set to orthographic
-    cam_data.ortho_scale = ortho_scale  # Set the orthographic scale
+    # Share the camera data among all cameras with the same orthographic scale
+    cam_data = get_ortho_camera_data(ortho_scale)
     
     # Create camera object
-    cam_obj = bpy.data.objects.new(name, cam_data)
+    cam_obj = data_objects.new(name, cam_data)
     cam_obj.location = location
     
     # Point camera at target
@@ -262,9 +392,7 @@ def create_camera(name, location, target, ortho_scale, collection):
     rot_quat = direction.to_track_quat('-Z', 'Y')
     cam_obj.rotation_euler = rot_quat.to_euler()
     
-    # Link to scene temporarily and then to the collection
-    bpy.context.scene.collection.objects.link(cam_obj)
-    bpy.context.scene.collection.objects.unlink(cam_obj)
+    # Link straight to the collection
     collection.objects.link(cam_obj)
     
     return cam_obj
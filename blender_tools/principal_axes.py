@@ -1,9 +1,49 @@
 import bpy
 import numpy as np
-from mathutils import Matrix, Vector, kdtree
+from mathutils import Matrix, Vector
 import bmesh
+import ctypes
 import math
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    from sklearn.neighbors import BallTree
+except ImportError:
+    BallTree = None
+
+try:
+    import opt_einsum
+except ImportError:
+    opt_einsum = None
+
+# Offsets from a grid cell to itself and its 26 neighbors
+NEIGHBOR_CELL_OFFSETS = np.indices((3, 3, 3)).reshape(3, -1).T - 1
+
+# Most (vertex, candidate) pairs count_neighbors_grid checks at once, which
+# bounds its memory use however many neighbors the vertices have
+MAX_GRID_PAIRS = 1 << 20
+
+# Fewest triangles for tetrahedra_moments_kernel to beat the vectorized numpy
+# path, given the cost of compiling it and starting its parallel region
+NUMBA_MIN_TRIS = 200_000
+
+# Permutes principal axes ordered from the longest extent to the shortest
+# into the columns (X, Y, Z) = (middle, shortest, longest)
+AXIS_PERMUTATION = np.array([
+    [0, 0, 1],
+    [1, 0, 0],
+    [0, 1, 0],
+], dtype=np.float64)
+
 
 def convert_to_mesh(obj, target_collection=None):
     """Convert an object to mesh if possible.
@@ -11,7 +51,7 @@ def convert_to_mesh(obj, target_collection=None):
     Args:
         obj: The object to convert
         target_collection: Collection to add the converted object to (defaults to obj's collection)
-        
+    
     Returns:
         The converted mesh object, or the original if already a mesh, or None if conversion failed
     """
@@ -46,7 +86,7 @@ def convert_to_mesh(obj, target_collection=None):
             bpy.ops.object.convert(target='MESH')
             
             return obj_copy
-            
+        
         except Exception as e:
             print(f"  Error converting {obj.name} to mesh: {e}")
             # Clean up partial objects if creation failed
@@ -59,22 +99,19 @@ def convert_to_mesh(obj, target_collection=None):
 
 def get_mesh_volume(obj):
     """Calculate the volume of a mesh object."""
-    # Create a new bmesh
-    bm = bmesh.new()
-    
-    # Fill bmesh with mesh data (in local space)
-    bm.from_mesh(obj.data)
-    
-    # Transform bmesh to world space
-    bm.transform(obj.matrix_world)
+    return get_triangles_volume(get_world_vertices(obj)[get_triangle_indices(obj)])
+
+
+def get_triangles_volume(tri):
+    """Calculate the volume enclosed by a closed triangle mesh.
     
-    # Calculate volume
-    volume = abs(bm.calc_volume())
+    Sums the signed volumes of the tetrahedra joining the origin to every
+    triangle, v0 . (v1 x v2) / 6, in a single einsum.
     
-    # Free the bmesh
-    bm.free()
-    
-    return volume
+    Args:
+        tri: Array of shape (F, 3, 3) with the corners of every triangle
+    """
+    return abs(np.einsum('fi,fi->', np.cross(tri[:, 0], tri[:, 1]), tri[:, 2])) / 6.0
 
 
 def create_volume_fiducial(name, location, volume, target_collection):
@@ -111,92 +148,308 @@ def create_volume_fiducial(name, location, volume, target_collection):
     return sphere
 
 
-def tetrahedron_volume(v1, v2, v3, v4):
-    """Calculate the volume of a tetrahedron formed by 4 vertices."""
-    return abs(np.dot(np.cross(v2 - v1, v3 - v1), v4 - v1)) / 6.0
+def get_world_vertices(obj):
+    """Get the world-space coordinates of all vertices of a mesh object.
+    
+    The coordinates are read in bulk and transformed in a single matrix product.
+    Their order matches bm.verts of a bmesh built from the same mesh.
+    
+    Returns:
+        Array of shape (N, 3)
+    """
+    coords = get_vertex_positions(obj.data)
+    
+    matrix_world = np.array(obj.matrix_world)
+    return coords @ matrix_world[:3, :3].T + matrix_world[:3, 3]
+
+
+def get_vertex_positions(mesh):
+    """Get the local vertex coordinates of a mesh as an (N, 3) array.
+    
+    On Blender versions that store positions as a contiguous "position"
+    attribute, the array is a zero-copy view of that buffer. It is only valid
+    until the mesh changes, so use it right away. Falls back to a
+    foreach_get copy otherwise.
+    """
+    num_verts = len(mesh.vertices)
+    positions = mesh.attributes.get("position")
+    if num_verts and positions is not None and positions.data_type == 'FLOAT_VECTOR':
+        address = positions.data[0].as_pointer()
+        buffer = (ctypes.c_float * (num_verts * 3)).from_address(address)
+        return np.ctypeslib.as_array(buffer).reshape(num_verts, 3)
+    
+    coords = np.empty(num_verts * 3)
+    mesh.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+
+def get_triangle_indices(obj):
+    """Get the vertex indices of the triangles of a mesh object.
+    
+    Returns:
+        Integer array of shape (F, 3) indexing into get_world_vertices(obj)
+    """
+    mesh = obj.data
+    mesh.calc_loop_triangles()
+    indices = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", indices)
+    return indices.reshape(-1, 3)
 
 
-def get_density_weights(bm, method='vertex_edge', radius=0.1):
-    """Calculate density weights for vertices based on vertex/edge concentrations.
+def canonicalize_axes(eigenvectors):
+    """Build the rotation matrix of a set of principal axes.
+    
+    Aligns Z with the longest dimension, X with the middle one and Y with the
+    shortest, flipping Y if needed to keep the coordinate system right-handed.
     
     Args:
-        bm: BMesh object to analyze
-        method: Weighting method ('vertex_edge', 'vertex', or 'edge')
-        radius: Radius for local density sampling
+        eigenvectors: 3x3 array with the axes as columns, ordered from the
+            longest extent to the shortest
+    
+    Returns:
+        4x4 rotation Matrix
+    """
+    axes = eigenvectors @ AXIS_PERMUTATION
+    if np.linalg.det(axes) < 0:
+        axes[:, 1] = -axes[:, 1]
+    return Matrix(axes.T).to_4x4()
+
+
+def count_neighbors(verts, radius):
+    """Count the vertices within radius of every vertex, including itself.
+    
+    Uses scipy's cKDTree or scikit-learn's BallTree to answer all queries in
+    one call when available, otherwise falls back to a uniform grid.
+    
+    Args:
+        verts: Array of shape (N, 3) with the vertex coordinates
+        radius: Search radius
+    
+    Returns:
+        Array of shape (N,) with the neighbor count of each vertex
+    """
+    if cKDTree is not None:
+        return cKDTree(verts).query_ball_point(verts, r=radius, return_length=True)
+    if BallTree is not None:
+        return BallTree(verts).query_radius(verts, r=radius, count_only=True)
+    return count_neighbors_grid(verts, radius)
+
+
+def count_neighbors_grid(verts, radius):
+    """Count the vertices within radius of every vertex using a uniform grid.
+    
+    With a cell size of radius, all neighbors of a vertex lie in its own cell
+    or one of the 26 around it. The vertices are sorted by cell so that every
+    cell is a contiguous run, found with searchsorted, and the distances to
+    all vertices of a run are checked at once, one neighbor offset at a time.
+    The vertices are queried in blocks of at most MAX_GRID_PAIRS pairs.
+    
+    Returns:
+        Array of shape (N,) with the neighbor count of each vertex
+    """
+    num_verts = len(verts)
+    if num_verts == 0:
+        return np.zeros(0, dtype=np.int64)
+    if radius <= 0:
+        # Only coincident vertices are neighbors
+        _, inverse, counts = np.unique(verts, axis=0, return_inverse=True, return_counts=True)
+        return counts[inverse.ravel()]
+    
+    # Integer cell of every vertex, padded by one so neighbor cells stay in range
+    cells = np.floor(verts / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    strides = np.array([dims[1] * dims[2], dims[2], 1])
+    keys = cells @ strides
+    
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    sorted_verts = verts[order]
+    
+    # Query the vertices in sorted order too, so that every block covers
+    # neighboring cells
+    radius_sq = radius * radius
+    sorted_counts = np.zeros(num_verts, dtype=np.int64)
+    for key_offset in (NEIGHBOR_CELL_OFFSETS @ strides).tolist():
+        neighbor_keys = sorted_keys + key_offset
+        starts = np.searchsorted(sorted_keys, neighbor_keys, side='left')
+        lengths = np.searchsorted(sorted_keys, neighbor_keys, side='right') - starts
+        ends = np.cumsum(lengths)
+        if ends[-1] == 0:
+            continue
         
+        block_start = 0
+        while block_start < num_verts:
+            # The longest block of vertices whose pairs fit the budget, at least one vertex
+            block_end = np.searchsorted(ends, ends[block_start] - lengths[block_start] + MAX_GRID_PAIRS,
+                                        side='right')
+            block_end = max(block_end, block_start + 1)
+            block_lengths = lengths[block_start:block_end]
+            total = ends[block_end - 1] - ends[block_start] + lengths[block_start]
+            
+            if total > 0:
+                # Pair every vertex of the block with each candidate in its neighbor cell's run
+                queries = np.repeat(np.arange(block_end - block_start), block_lengths)
+                run_starts = np.repeat(starts[block_start:block_end] - (np.cumsum(block_lengths) - block_lengths),
+                                       block_lengths)
+                candidates = run_starts + np.arange(total)
+                
+                diff = sorted_verts[block_start + queries] - sorted_verts[candidates]
+                within = np.einsum('ij,ij->i', diff, diff) <= radius_sq
+                sorted_counts[block_start:block_end] += np.bincount(queries[within],
+                                                                    minlength=block_end - block_start)
+            
+            block_start = block_end
+    
+    counts = np.empty(num_verts, dtype=np.int64)
+    counts[order] = sorted_counts
+    return counts
+
+
+def read_bmesh_arrays(bm):
+    """Copy the vertices, edges and triangles of a bmesh into numpy arrays.
+    
+    The bmesh is written to a temporary mesh once so that everything can be
+    read with foreach_get instead of walking the BMesh elements in Python.
+    
     Returns:
-        List of weights for each vertex
+        Tuple of (verts, edges, triangles) with shapes (N, 3), (E, 2) and (F, 3)
     """
-    weights = []
+    mesh = bpy.data.meshes.new("_pca_tmp")
+    try:
+        bm.to_mesh(mesh)
+        
+        verts = np.empty(len(mesh.vertices) * 3)
+        mesh.vertices.foreach_get("co", verts)
+        
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        
+        mesh.calc_loop_triangles()
+        triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("vertices", triangles)
+    finally:
+        bpy.data.meshes.remove(mesh)
+    
+    return verts.reshape(-1, 3), edges.reshape(-1, 2), triangles.reshape(-1, 3)
+
+
+def get_triangulated_arrays(obj):
+    """Triangulate a mesh object in world space and read it into numpy arrays.
+    
+    Returns:
+        Tuple of (verts, edges, triangles) as returned by read_bmesh_arrays
+    """
+    # Create bmesh
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    
+    # Transform bmesh to world space
+    bm.transform(obj.matrix_world)
+    
+    # Ensure triangulated faces
+    bmesh.ops.triangulate(bm, faces=bm.faces)
     
-    # Create a KDTree for vertex spatial lookup
-    size = len(bm.verts)
-    kd = kdtree.KDTree(size)
+    mesh_arrays = read_bmesh_arrays(bm)
+    bm.free()
     
-    # Insert vertices
-    for i, v in enumerate(bm.verts):
-        kd.insert(v.co, i)
-    kd.balance()
+    return mesh_arrays
+
+
+def get_density_weights(verts, edges, method='vertex_edge', radius=0.1):
+    """Calculate density weights for vertices based on vertex/edge concentrations.
     
+    Args:
+        verts: Array of shape (N, 3) with the vertex coordinates
+        edges: Integer array of shape (E, 2) with the vertex indices of every edge
+        method: Weighting method ('vertex_edge', 'vertex', or 'edge')
+        radius: Radius for local density sampling
+    
+    Returns:
+        Array of weights for each vertex
+    """
     # Calculate edge density if needed
     edge_counts = None
     if method in ['vertex_edge', 'edge']:
         # Count number of edges connected to each vertex
-        edge_counts = [len(v.link_edges) for v in bm.verts]
+        edge_counts = np.bincount(edges.ravel(), minlength=len(verts)).astype(float)
         
         if method == 'edge':
             return edge_counts
     
-    # Calculate vertex density and combine with edge density
-    for i, v in enumerate(bm.verts):
-        # Find vertices within radius
-        nearby_verts = [index for (co, index, dist) in kd.find_range(v.co, radius)]
-        
-        if method == 'vertex':
-            # Pure vertex density - just count nearby vertices
-            weights.append(len(nearby_verts))
-        elif method == 'vertex_edge':
-            # Combined vertex and edge density
-            edge_factor = edge_counts[i] if edge_counts else 1
-            weights.append(len(nearby_verts) * edge_factor)
+    if method not in ['vertex', 'vertex_edge']:
+        return np.empty(0)
+    
+    # Calculate vertex density - count nearby vertices
+    weights = count_neighbors(verts, radius).astype(float)
+    
+    # Combine with edge density
+    if method == 'vertex_edge':
+        weights *= edge_counts
     
     # Normalize weights to have mean of 1.0
-    if weights:
-        avg_weight = sum(weights) / len(weights)
+    if len(weights):
+        avg_weight = weights.mean()
         if avg_weight > 0:
-            weights = [w / avg_weight for w in weights]
+            weights /= avg_weight
     
     return weights
 
 
-def get_principal_axes_density_weighted(obj, density_method='vertex_edge', radius_factor=0.05):
+def get_weighted_scatter(points, weights):
+    """Calculate the weighted center and scatter matrix of points in a single pass.
+    
+    The scatter matrix sum(w * (x - c)(x - c)^T) is derived from the raw
+    moments as S2 - S0 * c c^T, so the points are only read once. To avoid
+    catastrophic cancellation for geometry far from the origin, the points
+    are first shifted by their bounding box midpoint.
+    
+    Args:
+        points: Array of shape (N, 3)
+        weights: Array of shape (N,) with the weight of each point
+    
+    Returns:
+        Tuple of (total_weight, center, scatter); center and scatter are None
+        if the total weight is not positive
+    """
+    total_weight = weights.sum()
+    if total_weight <= 0:
+        return total_weight, None, None
+    
+    origin = (points.min(axis=0) + points.max(axis=0)) / 2.0
+    shifted = points - origin
+    
+    # First and second raw moments about the origin
+    first_moment = weights @ shifted
+    second_moment = (shifted.T * weights) @ shifted
+    
+    mean_offset = first_moment / total_weight
+    scatter = second_moment - total_weight * np.outer(mean_offset, mean_offset)
+    
+    return total_weight, origin + mean_offset, scatter
+
+
+def get_principal_axes_density_weighted(obj, density_method='vertex_edge', radius_factor=0.05, mesh_arrays=None):
     """Calculate principal axes using vertex and edge density weighting.
     
     Args:
         obj: The mesh object to analyze
         density_method: Method for density calculation ('vertex_edge', 'vertex', or 'edge')
         radius_factor: Relative radius for density sampling, as a fraction of object size
-        
+        mesh_arrays: Optional result of get_triangulated_arrays(obj), computed if not given
+    
     Returns:
         Tuple of (center_of_mass, rotation_matrix) or (None, None) if calculation fails
     """
-    # Create bmesh
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    
-    # Transform bmesh to world space
-    bm.transform(obj.matrix_world)
+    if mesh_arrays is None:
+        mesh_arrays = get_triangulated_arrays(obj)
+    verts, edges, _ = mesh_arrays
     
-    # Ensure triangulated faces
-    bmesh.ops.triangulate(bm, faces=bm.faces)
-    
-    if len(bm.verts) == 0:
-        bm.free()
+    if len(verts) == 0:
         return None, None
     
     # Determine an appropriate radius for density calculation
     # Get object dimensions
-    verts = np.array([[v.co.x, v.co.y, v.co.z] for v in bm.verts])
     min_coords = np.min(verts, axis=0)
     max_coords = np.max(verts, axis=0)
     dimensions = max_coords - min_coords
@@ -207,147 +460,155 @@ def get_principal_axes_density_weighted(obj, density_method='vertex_edge', radiu
     
     # Calculate density weights
     print(f"  Calculating {density_method} density with radius {radius:.3f}")
-    weights = get_density_weights(bm, method=density_method, radius=radius)
+    weights = get_density_weights(verts, edges, method=density_method, radius=radius)
     
-    # Calculate weighted center of mass
-    total_weight = sum(weights)
+    # Calculate weighted center of mass and covariance matrix in a single pass
+    total_weight, center_of_mass, scatter = get_weighted_scatter(verts, weights)
     if total_weight > 0:
-        center_of_mass = np.zeros(3)
-        for i, v in enumerate(bm.verts):
-            center_of_mass += np.array([v.co.x, v.co.y, v.co.z]) * weights[i]
-        center_of_mass /= total_weight
+        covariance_matrix = scatter / total_weight
     else:
         # Fallback to simple average if weighting fails
         center_of_mass = np.mean(verts, axis=0)
-    
-    # Calculate weighted covariance matrix
-    covariance_matrix = np.zeros((3, 3))
-    
-    if total_weight > 0:
-        for i, v in enumerate(bm.verts):
-            # Vector from center of mass to vertex
-            d = np.array([v.co.x, v.co.y, v.co.z]) - center_of_mass
-            
-            # Weighted contribution to covariance matrix
-            covariance_matrix += weights[i] * np.outer(d, d)
-        
-        # Normalize
-        covariance_matrix /= total_weight
+        covariance_matrix = np.zeros((3, 3))
     
     # Handle potential numerical issues
     if np.isnan(covariance_matrix).any() or np.isinf(covariance_matrix).any():
         print("  Warning: Numerical issues in density-weighted calculation. Falling back to volume method.")
-        bm.free()
-        return get_principal_axes_volume(obj)
+        return get_principal_axes_volume(obj, mesh_arrays)
     
     try:
         # Get eigenvalues and eigenvectors
-        eigenvalues, eigenvectors = np.linalg.eigh(covariance_matrix)
-        
-        # Sort eigenvectors by eigenvalues in descending order (largest variance first)
-        idx = eigenvalues.argsort()[::-1]
-        eigenvalues = eigenvalues[idx]
-        eigenvectors = eigenvectors[:, idx]
-        
-        # Reorder eigenvectors to align:
-        # Z axis with longest dimension (highest eigenvalue) - eigenvectors[:,0]
-        # X axis with middle dimension (middle eigenvalue) - eigenvectors[:,1]
-        # Y axis with shortest dimension (lowest eigenvalue) - eigenvectors[:,2]
-        reordered_eigenvectors = np.column_stack([
-            eigenvectors[:, 1],  # X axis = middle eigenvector
-            eigenvectors[:, 2],  # Y axis = smallest eigenvector
-            eigenvectors[:, 0]   # Z axis = largest eigenvector
-        ])
+        _, eigenvectors = np.linalg.eigh(covariance_matrix)
         
-        # Ensure right-handed coordinate system
-        if np.linalg.det(reordered_eigenvectors) < 0:
-            # Flip Y axis to maintain right-handed system
-            reordered_eigenvectors[:, 1] = -reordered_eigenvectors[:, 1]
-        
-        # Clean up
-        bm.free()
-        
-        return Vector(center_of_mass), Matrix(reordered_eigenvectors.T).to_4x4()
+        # Largest variance first: Z = largest, X = middle, Y = smallest
+        return Vector(center_of_mass), canonicalize_axes(eigenvectors[:, ::-1])
     
     except np.linalg.LinAlgError:
         print("  Warning: Linear algebra error in density method. Falling back to volume method.")
-        bm.free()
-        return get_principal_axes_volume(obj)
+        return get_principal_axes_volume(obj, mesh_arrays)
 
 
-def get_principal_axes_volume(obj):
-    """Calculate principal axes based on volume distribution using tetrahedron method.
-    This is more accurate for solid objects than surface-based methods."""
-    # Create bmesh
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
+def get_tetrahedra_moments(tri, v0, min_volume=0.0):
+    """Accumulate the volume moments of the tetrahedra joining v0 to each triangle.
     
-    # Transform bmesh to world space
-    bm.transform(obj.matrix_world)
+    Degenerate tetrahedra, with a volume of at most min_volume, are masked out
+    up front. Meshes with at least NUMBA_MIN_TRIS triangles use a parallel numba
+    kernel that fuses everything into one pass when numba is available.
     
-    # Ensure triangulated faces
-    bmesh.ops.triangulate(bm, faces=bm.faces)
+    Args:
+        tri: Array of shape (F, 3, 3) with the corners of every triangle
+        v0: Reference point shared by all tetrahedra
+        min_volume: Volume at or below which a tetrahedron counts as degenerate
     
-    # First pass: Calculate approximate center of mass
-    # This is used as a reference point for tetrahedra
-    simple_center = Vector((0, 0, 0))
-    for v in bm.verts:
-        simple_center += v.co
+    Returns:
+        Tuple of (total_volume, volume-weighted sum of the tetrahedron centroids,
+        3x3 second moment of the tetrahedron vertices about their centroids,
+        weighted by vol / 4)
+    """
+    if tetrahedra_moments_kernel is not None and len(tri) >= NUMBA_MIN_TRIS:
+        return tetrahedra_moments_kernel(tri, np.asarray(v0, dtype=tri.dtype), min_volume)
+    
+    num_tris = len(tri)
+    
+    # Calculate tetrahedron volumes, keeping only the non-degenerate ones
+    edges = tri - v0
+    volumes = np.abs(np.einsum('fi,fi->f', np.cross(edges[:, 0], edges[:, 1]), edges[:, 2])) / 6.0
+    keep = volumes > min_volume
+    volumes = volumes[keep]
     
-    if len(bm.verts) > 0:
-        simple_center /= len(bm.verts)
+    # Tetrahedra as (F, 4, 3): the reference point followed by the triangle
+    tetra = np.concatenate([np.broadcast_to(v0, (num_tris, 1, 3)), tri], axis=1)[keep]
+    
+    # Tetrahedron centroids (average of the 4 vertices), accumulated by volume
+    tetra_centers = tetra.mean(axis=1)
+    
+    # Contributions of every tetrahedron vertex relative to its centroid
+    dx = tetra - tetra_centers[:, None, :]
+    # opt_einsum plans the contraction as a single GEMM when installed
+    if opt_einsum is not None:
+        second_moment = opt_einsum.contract('f,fvi,fvj->ij', volumes / 4.0, dx, dx, optimize='auto', backend='numpy')
     else:
-        bm.free()
-        return None, None
-        
-    # Second pass: Calculate center of mass and inertia tensor using tetrahedron method
-    total_volume = 0.0
-    center_of_mass = np.zeros(3)
-    inertia_tensor = np.zeros((3, 3))
-    
-    # Process each triangular face
-    for face in bm.faces:
-        if len(face.verts) != 3:
-            continue  # Skip non-triangular faces (should be none after triangulation)
-        
-        # Get vertices as numpy arrays
-        v1 = np.array([face.verts[0].co[0], face.verts[0].co[1], face.verts[0].co[2]])
-        v2 = np.array([face.verts[1].co[0], face.verts[1].co[1], face.verts[1].co[2]])
-        v3 = np.array([face.verts[2].co[0], face.verts[2].co[1], face.verts[2].co[2]])
-        v0 = np.array([simple_center[0], simple_center[1], simple_center[2]])
-        
-        # Calculate tetrahedron volume
-        vol = tetrahedron_volume(v0, v1, v2, v3)
-        
-        if vol > 0:
-            # Tetrahedron centroid (average of the 4 vertices)
-            tetra_center = (v0 + v1 + v2 + v3) / 4.0
-            
-            # Accumulate weighted center
-            center_of_mass += tetra_center * vol
-            total_volume += vol
-            
-            # Compute contribution to inertia tensor
-            # For each vertex in the tetrahedron
-            for v in [v0, v1, v2, v3]:
-                # Distance from approximated center of mass
-                dx = v - tetra_center
+        second_moment = np.einsum('f,fvi,fvj->ij', volumes / 4.0, dx, dx, optimize=True)
+    
+    return volumes.sum(), volumes @ tetra_centers, second_moment
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True)
+    def tetrahedra_moments_kernel(tri, v0, min_volume):
+        """Fused single-pass version of get_tetrahedra_moments."""
+        num_tris = tri.shape[0]
+        
+        # Each thread accumulates its own contiguous chunk, merged at the end
+        num_chunks = numba.get_num_threads()
+        chunk_size = (num_tris + num_chunks - 1) // num_chunks
+        volumes = np.zeros(num_chunks)
+        centers = np.zeros((num_chunks, 3))
+        moments = np.zeros((num_chunks, 3, 3))
+        
+        for k in numba.prange(num_chunks):
+            points = np.empty((4, 3))
+            center = np.empty(3)
+            for f in range(k * chunk_size, min((k + 1) * chunk_size, num_tris)):
+                for d in range(3):
+                    points[0, d] = v0[d]
+                    points[1, d] = tri[f, 0, d]
+                    points[2, d] = tri[f, 1, d]
+                    points[3, d] = tri[f, 2, d]
+                
+                # Volume from the determinant of the three edges from v0
+                ax, ay, az = points[1, 0] - v0[0], points[1, 1] - v0[1], points[1, 2] - v0[2]
+                bx, by, bz = points[2, 0] - v0[0], points[2, 1] - v0[1], points[2, 2] - v0[2]
+                cx, cy, cz = points[3, 0] - v0[0], points[3, 1] - v0[1], points[3, 2] - v0[2]
+                vol = abs(ax * (by * cz - bz * cy) - ay * (bx * cz - bz * cx) + az * (bx * cy - by * cx)) / 6.0
+                if vol <= min_volume:
+                    continue
                 
-                # Contribution to the inertia tensor (diagonal and off-diagonal terms)
-                # This is a simplified inertia tensor calculation that works for PCA
-                sq_dist = np.sum(dx**2)
-                inertia_tensor[0, 0] += (sq_dist - dx[0]**2) * vol / 4.0
-                inertia_tensor[1, 1] += (sq_dist - dx[1]**2) * vol / 4.0
-                inertia_tensor[2, 2] += (sq_dist - dx[2]**2) * vol / 4.0
+                for d in range(3):
+                    center[d] = (points[0, d] + points[1, d] + points[2, d] + points[3, d]) / 4.0
+                    centers[k, d] += center[d] * vol
+                volumes[k] += vol
                 
-                inertia_tensor[0, 1] -= dx[0] * dx[1] * vol / 4.0
-                inertia_tensor[0, 2] -= dx[0] * dx[2] * vol / 4.0
-                inertia_tensor[1, 2] -= dx[1] * dx[2] * vol / 4.0
+                weight = vol / 4.0
+                for v in range(4):
+                    for i in range(3):
+                        dx_i = points[v, i] - center[i]
+                        for j in range(3):
+                            moments[k, i, j] += weight * dx_i * (points[v, j] - center[j])
+        
+        return volumes.sum(), centers.sum(axis=0), moments.sum(axis=0)
+else:
+    tetrahedra_moments_kernel = None
+
+
+def get_principal_axes_volume(obj, mesh_arrays=None):
+    """Calculate principal axes based on volume distribution using tetrahedron method.
+    This is more accurate for solid objects than surface-based methods.
+    
+    mesh_arrays is an optional result of get_triangulated_arrays(obj) to reuse."""
+    if mesh_arrays is None:
+        mesh_arrays = get_world_vertices(obj), None, get_triangle_indices(obj)
+    verts, _, triangles = mesh_arrays
+    
+    # First pass: Calculate approximate center of mass
+    # This is used as a reference point for tetrahedra
+    if len(verts) > 0:
+        simple_center = verts.mean(axis=0)
+    else:
+        return None, None
     
-    # Mirror the off-diagonal terms (the tensor is symmetric)
-    inertia_tensor[1, 0] = inertia_tensor[0, 1]
-    inertia_tensor[2, 0] = inertia_tensor[0, 2]
-    inertia_tensor[2, 1] = inertia_tensor[1, 2]
+    # Second pass: Calculate center of mass and inertia tensor using tetrahedron method,
+    # with one tetrahedron per triangle, all processed at once
+    tri = verts[triangles]
+    
+    # Treat tetrahedra as degenerate relative to the size of the object
+    object_size = np.linalg.norm(verts.max(axis=0) - verts.min(axis=0))
+    min_volume = 1e-12 * object_size ** 3
+    total_volume, center_of_mass, second_moment = get_tetrahedra_moments(tri, simple_center, min_volume)
+    
+    # Inertia tensor from the second moment: sum of (|dx|^2 * I - dx dx^T) * vol / 4
+    # This is a simplified inertia tensor calculation that works for PCA
+    inertia_tensor = np.trace(second_moment) * np.eye(3) - second_moment
     
     # Finalize center of mass
     if total_volume > 0:
@@ -355,212 +616,123 @@ def get_principal_axes_volume(obj):
     else:
         # Fallback if volume calculation failed
         print("  Warning: Volume calculation failed. Using simple vertex average.")
-        center_of_mass = np.array([simple_center[0], simple_center[1], simple_center[2]])
+        center_of_mass = simple_center
     
     # Handle potential numerical issues
     if np.isnan(inertia_tensor).any() or np.isinf(inertia_tensor).any() or total_volume <= 0:
         print("  Warning: Numerical issues in inertia tensor calculation. Falling back to simpler method.")
-        bm.free()
-        return get_principal_axes_improved(obj)
+        return get_principal_axes_improved(obj, mesh_arrays)
     
     try:
         # Get eigenvalues and eigenvectors of the inertia tensor
-        eigenvalues, eigenvectors = np.linalg.eigh(inertia_tensor)
-        
-        # Sort eigenvectors by eigenvalues in ascending order
-        # For inertia tensor, smaller eigenvalues correspond to axes with larger spatial extent
-        idx = eigenvalues.argsort()
-        eigenvalues = eigenvalues[idx]
-        eigenvectors = eigenvectors[:, idx]
-        
-        # Reorder eigenvectors to align:
-        # Z axis with longest dimension (smallest eigenvalue in inertia tensor) - eigenvectors[:,0]
-        # X axis with middle dimension - eigenvectors[:,1]
-        # Y axis with shortest dimension - eigenvectors[:,2]
-        reordered_eigenvectors = np.column_stack([
-            eigenvectors[:, 1],  # X axis = middle eigenvector
-            eigenvectors[:, 2],  # Y axis = smallest eigenvector (largest eigenvalue)
-            eigenvectors[:, 0]   # Z axis = largest eigenvector (smallest eigenvalue)
-        ])
+        _, eigenvectors = np.linalg.eigh(inertia_tensor)
         
-        # Ensure right-handed coordinate system
-        if np.linalg.det(reordered_eigenvectors) < 0:
-            # Flip Y axis to maintain right-handed system
-            reordered_eigenvectors[:, 1] = -reordered_eigenvectors[:, 1]
-        
-        # Clean up
-        bm.free()
-        
-        return Vector(center_of_mass), Matrix(reordered_eigenvectors.T).to_4x4()
+        # For the inertia tensor, smaller eigenvalues correspond to axes with larger
+        # spatial extent, so the ascending order already puts the longest axis first
+        return Vector(center_of_mass), canonicalize_axes(eigenvectors)
     
     except np.linalg.LinAlgError:
         print("  Warning: Linear algebra error in volume-based method. Falling back to area-based method.")
-        bm.free()
-        return get_principal_axes_improved(obj)
+        return get_principal_axes_improved(obj, mesh_arrays)
 
 
-def get_principal_axes_improved(obj):
+def get_principal_axes_improved(obj, mesh_arrays=None):
     """Calculate principal axes for a mesh object using geometrically correct PCA.
-    This method accounts for face areas when computing the covariance matrix."""
-    # Create bmesh
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
+    This method accounts for face areas when computing the covariance matrix.
     
-    # Transform bmesh to world space
-    bm.transform(obj.matrix_world)
+    mesh_arrays is an optional result of get_triangulated_arrays(obj) to reuse."""
+    if mesh_arrays is None:
+        mesh_arrays = get_triangulated_arrays(obj)
+    verts, _, triangles = mesh_arrays
     
-    # Ensure triangulated faces
-    bmesh.ops.triangulate(bm, faces=bm.faces)
+    # Corners of every triangle, shape (F, 3, 3)
+    tri = verts[triangles]
     
-    # Calculate center of mass weighted by face areas
-    total_area = 0.0
-    weighted_center = np.zeros(3)
+    # Calculate face areas of all triangles at once
+    areas = np.linalg.norm(np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]), axis=1) / 2.0
     
-    for face in bm.faces:
-        # Get vertices in world space
-        vertices = [v.co for v in face.verts]
-        
-        # Calculate face area
-        if len(vertices) >= 3:
-            # For triangle, get area directly
-            area = face.calc_area()
-            
-            # Calculate face center
-            face_center = sum((v.co for v in face.verts), Vector((0,0,0))) / len(face.verts)
-            
-            # Accumulate weighted center
-            weighted_center += np.array([face_center[0], face_center[1], face_center[2]]) * area
-            total_area += area
-    
-    if total_area > 0:
-        center_of_mass = weighted_center / total_area
-    else:
+    # Calculate center of mass and covariance matrix weighted by face areas: every
+    # triangle vertex contributes with weight area/3, so the weighted mean of the
+    # vertices equals the area-weighted mean of the face centers
+    total_area, center_of_mass, covariance_matrix = get_weighted_scatter(
+        tri.reshape(-1, 3), np.repeat(areas / 3.0, 3)
+    )
+    if total_area <= 0:
         # Fallback to simple mean if no faces with area
-        verts = np.array([[v.co.x, v.co.y, v.co.z] for v in bm.verts])
         center_of_mass = np.mean(verts, axis=0)
-    
-    # Create covariance matrix using triangular faces
-    covariance_matrix = np.zeros((3, 3))
-    
-    for face in bm.faces:
-        if len(face.verts) >= 3:
-            # Get vertices as numpy arrays
-            verts = [np.array([v.co[0], v.co[1], v.co[2]]) for v in face.verts]
-            
-            # Calculate centroid of the face
-            face_center = sum(verts) / len(verts)
-            
-            # Calculate face area
-            area = face.calc_area()
-            
-            # Contribution to covariance matrix - weighted by face area
-            for v in verts:
-                # Vector from center of mass to vertex
-                d = v - center_of_mass
-                
-                # Outer product contribution weighted by area/nvertices
-                weight = area / len(verts)
-                covariance_matrix += weight * np.outer(d, d)
+        covariance_matrix = np.zeros((3, 3))
     
     # Handle potential numerical issues
     if np.isnan(covariance_matrix).any() or np.isinf(covariance_matrix).any():
         print("  Warning: Numerical issues in covariance calculation. Falling back to simpler method.")
-        bm.free()
-        return get_principal_axes_simple(obj)
+        return get_principal_axes_simple(obj, mesh_arrays)
     
     try:
         # Get eigenvalues and eigenvectors
-        eigenvalues, eigenvectors = np.linalg.eigh(covariance_matrix)
-        
-        # Sort eigenvectors by eigenvalues in descending order
-        idx = eigenvalues.argsort()[::-1]
-        eigenvalues = eigenvalues[idx]
-        eigenvectors = eigenvectors[:, idx]
-        
-        # Reorder eigenvectors to align:
-        # Z axis with longest dimension (highest eigenvalue) - eigenvectors[:,0]
-        # X axis with middle dimension (middle eigenvalue) - eigenvectors[:,1]
-        # Y axis with shortest dimension (lowest eigenvalue) - eigenvectors[:,2]
+        _, eigenvectors = np.linalg.eigh(covariance_matrix)
         
-        # Create reordered matrix: [middle, smallest, largest]
-        # so that Z = largest, X = middle, Y = smallest
-        reordered_eigenvectors = np.column_stack([
-            eigenvectors[:, 1],  # X axis = middle eigenvector
-            eigenvectors[:, 2],  # Y axis = smallest eigenvector
-            eigenvectors[:, 0]   # Z axis = largest eigenvector
-        ])
-        
-        # Ensure right-handed coordinate system
-        if np.linalg.det(reordered_eigenvectors) < 0:
-            # Flip Y axis to maintain right-handed system
-            reordered_eigenvectors[:, 1] = -reordered_eigenvectors[:, 1]
-        
-        # Clean up
-        bm.free()
-        
-        return Vector(center_of_mass), Matrix(reordered_eigenvectors.T).to_4x4()
+        # Largest variance first: Z = largest, X = middle, Y = smallest
+        return Vector(center_of_mass), canonicalize_axes(eigenvectors[:, ::-1])
     
     except np.linalg.LinAlgError:
         print("  Warning: Linear algebra error. Falling back to simpler method.")
-        bm.free()
-        return get_principal_axes_simple(obj)
+        return get_principal_axes_simple(obj, mesh_arrays)
 
 
-def get_principal_axes_simple(obj):
-    """Calculate principal axes using a simpler vertex-based method as fallback."""
-    # Get mesh data
-    mesh = obj.data
+def get_principal_axes_simple(obj, mesh_arrays=None):
+    """Calculate principal axes using a simpler vertex-based method as fallback.
     
+    mesh_arrays is an optional result of get_triangulated_arrays(obj) to reuse."""
     # Get vertices in world space
-    vertices = [obj.matrix_world @ v.co for v in mesh.vertices]
-    if not vertices:
+    points = get_world_vertices(obj) if mesh_arrays is None else mesh_arrays[0]
+    if len(points) == 0:
         return None, None
     
-    # Convert to numpy array
-    points = np.array(vertices)
-    
     # Calculate center of mass
     center_of_mass = np.mean(points, axis=0)
     
     # Center the points
     centered_points = points - center_of_mass
     
-    # Calculate covariance matrix
-    cov_matrix = np.cov(centered_points, rowvar=False)
+    # Calculate covariance matrix (sample covariance, as np.cov) in one product
+    if len(points) < 2:
+        return None, None
+    cov_matrix = centered_points.T @ centered_points / (len(points) - 1)
     
     # Calculate eigenvectors and eigenvalues
     if np.isnan(cov_matrix).any() or np.isinf(cov_matrix).any():
         return None, None
     
     try:
-        eigenvalues, eigenvectors = np.linalg.eigh(cov_matrix)
+        _, eigenvectors = np.linalg.eigh(cov_matrix)
     except np.linalg.LinAlgError:
         return None, None
     
-    # Sort eigenvectors by eigenvalues in descending order
-    idx = eigenvalues.argsort()[::-1]
-    eigenvalues = eigenvalues[idx]
-    eigenvectors = eigenvectors[:, idx]
+    # Largest variance first: Z = largest, X = middle, Y = smallest
+    return Vector(center_of_mass), canonicalize_axes(eigenvectors[:, ::-1])
+
+
+def analyze_mesh(obj, density_method='vertex_edge'):
+    """Calculate the density-weighted principal axes and the volume of a mesh object.
     
-    # Reorder eigenvectors to align:
-    # Z axis with longest dimension (highest eigenvalue) - eigenvectors[:,0]
-    # X axis with middle dimension (middle eigenvalue) - eigenvectors[:,1]
-    # Y axis with shortest dimension (lowest eigenvalue) - eigenvectors[:,2]
+    The mesh is converted to a world-space, triangulated bmesh only once and
+    shared by both calculations.
     
-    # Create reordered matrix: [middle, smallest, largest]
-    # so that Z = largest, X = middle, Y = smallest
-    reordered_eigenvectors = np.column_stack([
-        eigenvectors[:, 1],  # X axis = middle eigenvector
-        eigenvectors[:, 2],  # Y axis = smallest eigenvector
-        eigenvectors[:, 0]   # Z axis = largest eigenvector
-    ])
+    Returns:
+        Tuple of (center_of_mass, rotation_matrix, volume); center_of_mass and
+        rotation_matrix are None if the axes could not be calculated
+    """
+    mesh_arrays = get_triangulated_arrays(obj)
     
-    # Ensure the coordinate system is right-handed
-    if np.linalg.det(reordered_eigenvectors) < 0:
-        # Flip Y axis to maintain right-handed system
-        reordered_eigenvectors[:, 1] = -reordered_eigenvectors[:, 1]
+    # Calculate volume from the triangles already in hand
+    verts, _, triangles = mesh_arrays
+    volume = get_triangles_volume(verts[triangles])
     
-    return Vector(center_of_mass), Matrix(reordered_eigenvectors.T).to_4x4()
+    center, rotation_matrix = get_principal_axes_density_weighted(
+        obj, density_method=density_method, mesh_arrays=mesh_arrays
+    )
+    
+    return center, rotation_matrix, volume
 
 
 def create_coordinate_frame(name, location, rotation, target_collection):
@@ -614,7 +786,7 @@ def join_meshes(objects, target_name, target_collection):
         objects: List of objects to join
         target_name: Name for the joined result
         target_collection: Collection to place the result in
-        
+    
     Returns:
         The joined object or None if joining failed
     """
@@ -679,7 +851,7 @@ def process_collections():
         # Skip our output collections
         if collection.name in ["Joined Models", "Axes and Fiducials"]:
             continue
-            
+        
         print(f"Processing collection: {collection.name}")
         
         # Get convertible objects
@@ -691,7 +863,7 @@ def process_collections():
             # Skip already processed objects
             if obj.name.endswith("_joined"):
                 continue
-                
+            
             original_object_names.append(obj.name)
             
             if obj.type == 'MESH':
@@ -717,7 +889,7 @@ def process_collections():
             if not joined_obj:
                 print(f"  Failed to join objects in {collection.name}")
                 continue
-                
+            
             print(f"  Created joined mesh: {joined_obj.name}")
             
             # Hide original objects - Use object names to look up objects again
@@ -731,7 +903,7 @@ def process_collections():
             
             # Use density-weighted PCA first, then fallback to volume-based if it fails
             print(f"  Computing density-weighted principal axes for {joined_obj.name}")
-            center, rotation_matrix = get_principal_axes_density_weighted(joined_obj, density_method='vertex_edge')
+            center, rotation_matrix, volume = analyze_mesh(joined_obj, density_method='vertex_edge')
             
             if center is None or rotation_matrix is None:
                 print(f"  Could not calculate principal axes for {joined_obj.name}")
@@ -742,8 +914,7 @@ def process_collections():
             create_coordinate_frame(frame_name, center, rotation_matrix, visualization_collection)
             print(f"  Created coordinate frame: {frame_name}")
             
-            # Calculate volume and create a fiducial sphere in the visualization collection
-            volume = get_mesh_volume(joined_obj)
+            # Create a fiducial sphere sized by volume in the visualization collection
             fiducial_name = f"{collection.name}_fiducial"
             create_volume_fiducial(fiducial_name, center, volume, visualization_collection)
             print(f"  Created volume fiducial: {fiducial_name} (volume: {volume:.3f})")
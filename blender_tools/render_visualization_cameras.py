@@ -1,8 +1,58 @@
 import bpy
 import os
-import bmesh
+import subprocess
+import tempfile
+import zlib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from mathutils import Vector
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Which corners of the wireframe box take the max (True) or min (False)
+# coordinate on each axis: bottom face first, then top face
+BBOX_CORNER_IS_MAX = np.array([
+    (False, False, False),
+    (True, False, False),
+    (True, True, False),
+    (False, True, False),
+    (False, False, True),
+    (True, False, True),
+    (True, True, True),
+    (False, True, True),
+])
+
+# Edges of the wireframe box as flattened index pairs into its 8 corners
+# (bottom face, top face, then the vertical edges)
+BBOX_EDGES = np.array([
+    0, 1, 1, 2, 2, 3, 3, 0,
+    4, 5, 5, 6, 6, 7, 7, 4,
+    0, 4, 1, 5, 2, 6, 3, 7,
+], dtype=np.int32)
+
+# Name of the material shared by all bounding boxes
+BBOX_MATERIAL_NAME = "BBox_Material_Shared"
+
+# Rotations of the cameras looking down each axis (from +X, +Y and +Z toward
+# the center), as the Euler angles of to_track_quat('-Z', 'Y')
+CAMERA_X_ROTATION = Vector((-1, 0, 0)).to_track_quat('-Z', 'Y').to_euler()
+CAMERA_Y_ROTATION = Vector((0, -1, 0)).to_track_quat('-Z', 'Y').to_euler()
+CAMERA_Z_ROTATION = Vector((0, 0, -1)).to_track_quat('-Z', 'Y').to_euler()
+
+# Fewest coordinates a mesh needs for transformed_bounds_kernel to beat numpy,
+# given the cost of starting its parallel region
+NUMBA_MIN_COORDS = 100_000
+
+# Scratch buffer for vertex coordinates, reused across calls and only grown when too small
+_scratch_buffer = np.empty(0, dtype=np.float32)
+
+# Print a line for every collection, object and camera handled, not just the totals
+VERBOSE = False
+
 # Include the list_collections_detailed function directly in this file
 def list_collections_detailed():
     """
@@ -19,203 +69,314 @@ def list_collections_detailed():
     print(f"Master collection: {master_collection.name} with {len(master_collection.objects)} direct objects")
     print(f"Master collection has {len(master_collection.children)} child collections")
     
+    collections = bpy.data.collections
+    
     # Create or get the visualization collection
-    if "Collection_Visualization" not in bpy.data.collections:
-        viz_collection = bpy.data.collections.new("Collection_Visualization")
+    viz_collection = collections.get("Collection_Visualization")
+    if viz_collection is None:
+        viz_collection = collections.new("Collection_Visualization")
         bpy.context.scene.collection.children.link(viz_collection)
         print("Created new Collection_Visualization")
     else:
-        viz_collection = bpy.data.collections["Collection_Visualization"]
         print("Using existing Collection_Visualization")
     
     # Create or get the bounding boxes collection
-    if "BoundingBoxes" not in bpy.data.collections:
-        bbox_collection = bpy.data.collections.new("BoundingBoxes")
+    bbox_collection = collections.get("BoundingBoxes")
+    if bbox_collection is None:
+        bbox_collection = collections.new("BoundingBoxes")
         viz_collection.children.link(bbox_collection)
         print("Created new BoundingBoxes collection")
     else:
-        bbox_collection = bpy.data.collections["BoundingBoxes"]
         print("Using existing BoundingBoxes collection")
     
     # Create or get the cameras collection
-    if "OrthoCameras" not in bpy.data.collections:
-        camera_collection = bpy.data.collections.new("OrthoCameras")
+    camera_collection = collections.get("OrthoCameras")
+    if camera_collection is None:
+        camera_collection = collections.new("OrthoCameras")
         viz_collection.children.link(camera_collection)
         print("Created new OrthoCameras collection")
     else:
-        camera_collection = bpy.data.collections["OrthoCameras"]
         print("Using existing OrthoCameras collection")
     
-    # Function to recursively print collections with details
-    def print_collection_details(collection, indent=0):
+    # Print the hierarchy with details, walking it depth-first with an explicit
+    # stack; children are pushed in reverse so they pop in order
+    stack = [(master_collection, 0)]
+    while stack:
+        collection, indent = stack.pop()
         prefix = "  " * indent
-        print(f"{prefix}Collection: {collection.name}")
-        print(f"{prefix}  - Objects: {len(collection.objects)}")
-        print(f"{prefix}  - Visible: {'Yes' if not collection.hide_viewport else 'No'}")
-        print(f"{prefix}  - Renderable: {'Yes' if not collection.hide_render else 'No'}")
-        
-        # Create bounding box and cameras for this collection
-        bbox_obj = create_bounding_box(collection, bbox_collection)
+        if VERBOSE:
+            print(f"{prefix}Collection: {collection.name}")
+            print(f"{prefix}  - Objects: {len(collection.objects)}")
+            print(f"{prefix}  - Visible: {'Yes' if not collection.hide_viewport else 'No'}")
+            print(f"{prefix}  - Renderable: {'Yes' if not collection.hide_render else 'No'}")
         
-        # If a bounding box was created, add cameras
-        if bbox_obj:
-            create_orthographic_cameras(collection, bbox_obj, camera_collection)
+        # Create bounding box and cameras for collections with visible meshes
+        bounds = get_collections_bounds([collection]).get(collection)
+        if bounds is not None:
+            create_bounding_box(collection, bbox_collection, *bounds)
+            create_orthographic_cameras(collection, *bounds, camera_collection)
         
         # List objects in this collection
-        if len(collection.objects) > 0:
+        if VERBOSE and len(collection.objects) > 0:
             print(f"{prefix}  - Object list:")
             for obj in collection.objects:
                 print(f"{prefix}    • {obj.name} ({obj.type})")
         
         # Process child collections
-        for child in collection.children:
-            print_collection_details(child, indent + 1)
+        stack.extend((child, indent + 1) for child in reversed(collection.children))
+
+def get_collections_bounds(collections):
+    """Get the world-space (min, max) of the visible meshes directly in each collection.
+    
+    Gathers the meshes of all collections first, bounds every mesh once no
+    matter how many of the collections it is in, then reduces the object
+    bounds of each collection segment by segment in a single call.
     
-    # Print the hierarchy with details
-    print_collection_details(master_collection)
+    Returns:
+        Dict mapping every collection with visible meshes to a tuple of
+        (min_co, max_co) Vectors
+    """
+    # Give every visible mesh one row; each collection is a segment of rows
+    rows = {}
+    with_meshes = []
+    segments = []
+    for collection in collections:
+        segment = [rows.setdefault(obj, len(rows)) for obj in collection.objects
+                   if obj.type == 'MESH' and not obj.hide_viewport]
+        if segment:
+            with_meshes.append(collection)
+            segments.append(segment)
+    
+    if not rows:
+        return {}
+    
+    # Bound the evaluated meshes, so that modifiers are taken into account
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated_objects = [obj.evaluated_get(depsgraph) for obj in rows]
+    
+    # Read everything from bpy up front on this thread; every mesh gets its
+    # own slice of one buffer so that all reads stay valid until transformed
+    vert_counts = [len(obj.data.vertices) for obj in evaluated_objects]
+    buffer = get_scratch_buffer(sum(vert_counts) * 3)
+    read_rows = []
+    local_coords = []
+    offset = 0
+    for row, (obj, num_verts) in enumerate(zip(evaluated_objects, vert_counts)):
+        local = get_local_coords(obj, buffer[offset * 3:(offset + num_verts) * 3])
+        offset += num_verts
+        if local is not None:
+            read_rows.append(row)
+            local_coords.append(local)
+    
+    # Meshes without vertices keep inverted bounds, which drop out of the reduction
+    object_min = np.full((len(rows), 3), np.inf, dtype=np.float32)
+    object_max = np.full((len(rows), 3), -np.inf, dtype=np.float32)
+    
+    # Large meshes go through the numba kernel when available, one at a time on
+    # this thread, as the kernel runs its own threads over the vertices
+    if transformed_bounds_kernel is not None:
+        large = [i for i, (coords, _) in enumerate(local_coords) if len(coords) >= NUMBA_MIN_COORDS]
+        for i in large:
+            object_min[read_rows[i]], object_max[read_rows[i]] = transformed_bounds_kernel(*local_coords[i])
+        large = set(large)
+        small = [i for i in range(len(local_coords)) if i not in large]
+    else:
+        small = range(len(local_coords))
+    
+    # Transform and reduce the other meshes in parallel; this only touches numpy
+    # arrays, which release the GIL while they work
+    if small:
+        with ThreadPoolExecutor() as executor:
+            object_bounds = list(executor.map(get_transformed_bounds,
+                                              *zip(*(local_coords[i] for i in small))))
+        for i, (min_co, max_co) in zip(small, object_bounds):
+            object_min[read_rows[i]] = min_co
+            object_max[read_rows[i]] = max_co
+    
+    # Reduce the rows of every collection in one call
+    offsets = np.cumsum([0] + [len(segment) for segment in segments[:-1]])
+    segment_rows = np.concatenate(segments)
+    min_cos = np.minimum.reduceat(object_min[segment_rows], offsets)
+    max_cos = np.maximum.reduceat(object_max[segment_rows], offsets)
+    
+    return {collection: (Vector(min_co), Vector(max_co))
+            for collection, min_co, max_co in zip(with_meshes, min_cos, max_cos)
+            if np.isfinite(min_co).all()}
 
-def create_bounding_box(collection, bbox_collection):
-    """Create a wireframe bounding box around all objects in the collection."""
-    print(f"Attempting to create bounding box for collection: {collection.name}")
-    print(f"  Collection has {len(collection.objects)} objects")
-    
-    if not collection.objects:
-        print(f"  Skipping empty collection: {collection.name}")
-        return None  # Skip empty collections
-    
-    # Calculate bounds
-    min_co = Vector((float('inf'), float('inf'), float('inf')))
-    max_co = Vector((float('-inf'), float('-inf'), float('-inf')))
-    
-    # Check if collection has any visible objects
-    has_visible_objects = False
-    
-    for obj in collection.objects:
-        if obj.type == 'MESH' and not obj.hide_viewport:
-            has_visible_objects = True
-            print(f"  Found visible mesh: {obj.name}")
-            
-            # Get object's world matrix
-            world_matrix = obj.matrix_world
-            
-            # Get object's bounding box in world space
-            for v in obj.bound_box:
-                world_v = world_matrix @ Vector(v)
-                
-                # Update min and max coordinates
-                min_co.x = min(min_co.x, world_v.x)
-                min_co.y = min(min_co.y, world_v.y)
-                min_co.z = min(min_co.z, world_v.z)
-                
-                max_co.x = max(max_co.x, world_v.x)
-                max_co.y = max(max_co.y, world_v.y)
-                max_co.z = max(max_co.z, world_v.z)
-    
-    if not has_visible_objects:
-        print(f"  No visible mesh objects in collection: {collection.name}")
-        return None
+def create_bounding_box(collection, bbox_collection, min_co, max_co):
+    """Create a wireframe bounding box from min_co to max_co for the collection."""
+    data_objects = bpy.data.objects
     
     # Create bounding box mesh
     bbox_name = f"BBox_{collection.name}"
     
     # Remove existing bounding box if it exists
-    if bbox_name in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[bbox_name])
+    existing = data_objects.get(bbox_name)
+    if existing is not None:
+        data_objects.remove(existing)
     
     # Create new mesh and object
     mesh = bpy.data.meshes.new(bbox_name)
-    bbox_obj = bpy.data.objects.new(bbox_name, mesh)
+    bbox_obj = data_objects.new(bbox_name, mesh)
     
-    # Link to scene and then to the bounding box collection
-    bpy.context.scene.collection.objects.link(bbox_obj)
-    bpy.context.scene.collection.objects.unlink(bbox_obj)
+    # Link straight to the bounding box collection
     bbox_collection.objects.link(bbox_obj)
     
-    # Create bmesh
-    bm = bmesh.new()
-    
-    # Create vertices
-    v1 = bm.verts.new((min_co.x, min_co.y, min_co.z))
-    v2 = bm.verts.new((max_co.x, min_co.y, min_co.z))
-    v3 = bm.verts.new((max_co.x, max_co.y, min_co.z))
-    v4 = bm.verts.new((min_co.x, max_co.y, min_co.z))
-    v5 = bm.verts.new((min_co.x, min_co.y, max_co.z))
-    v6 = bm.verts.new((max_co.x, min_co.y, max_co.z))
-    v7 = bm.verts.new((max_co.x, max_co.y, max_co.z))
-    v8 = bm.verts.new((min_co.x, max_co.y, max_co.z))
-    
-    # Create edges
-    bm.edges.new((v1, v2))
-    bm.edges.new((v2, v3))
-    bm.edges.new((v3, v4))
-    bm.edges.new((v4, v1))
-    
-    bm.edges.new((v5, v6))
-    bm.edges.new((v6, v7))
-    bm.edges.new((v7, v8))
-    bm.edges.new((v8, v5))
-    
-    bm.edges.new((v1, v5))
-    bm.edges.new((v2, v6))
-    bm.edges.new((v3, v7))
-    bm.edges.new((v4, v8))
-    
-    # Update mesh
-    bm.to_mesh(mesh)
-    bm.free()
+    # Fill the wireframe's corners and edges in bulk
+    bbox_corners = np.where(BBOX_CORNER_IS_MAX, max_co, min_co).astype(np.float32)
+    mesh.vertices.add(8)
+    mesh.vertices.foreach_set("co", bbox_corners.ravel())
+    mesh.edges.add(12)
+    mesh.edges.foreach_set("vertices", BBOX_EDGES)
+    mesh.update()
     
     # Set display properties
     bbox_obj.display_type = 'WIRE'
     bbox_obj.show_in_front = True
     
-    # Create a material for the bounding box with a unique color based on collection name
-    if f"BBox_Material_{collection.name}" not in bpy.data.materials:
-        mat = bpy.data.materials.new(f"BBox_Material_{collection.name}")
+    # Give the bounding box a unique color based on a CRC32 of the collection name;
+    # the shared material picks it up from the object
+    hash_val = zlib.crc32(collection.name.encode())
+    r = ((hash_val >> 16) & 0xFF) / 255.0
+    g = ((hash_val >> 8) & 0xFF) / 255.0
+    b = (hash_val & 0xFF) / 255.0
+    bbox_obj.color = (r, g, b, 1.0)
+    mesh.materials.append(get_bbox_material())
+    
+    # Store the bounds as a single custom property; center and size derive from it
+    bbox_obj["bounds"] = (*min_co, *max_co)
+    
+    if VERBOSE:
+        print(f"  Created bounding box for collection: {collection.name}")
+    return bbox_obj
+
+def is_bounding_box_current(collection, min_co, max_co):
+    """Whether the collection's bounding box and cameras were built for the bounds from min_co to max_co.
+    
+    Compares against the bounds stored on the box when it was created, so an
+    unchanged collection can keep its box and cameras instead of rebuilding them.
+    """
+    data_objects = bpy.data.objects
+    bbox_obj = data_objects.get(f"BBox_{collection.name}")
+    if bbox_obj is None or tuple(bbox_obj.get("bounds", ())) != (*min_co, *max_co):
+        return False
+    return all(f"Camera_{axis}_{collection.name}" in data_objects for axis in "XYZ")
+
+def get_scratch_buffer(size):
+    """Get a float32 scratch array of the given size.
+    
+    The array is a view of a module-level buffer that is only reallocated
+    when a larger size is requested, so its contents are only valid until
+    the next call.
+    """
+    global _scratch_buffer
+    if _scratch_buffer.size < size:
+        _scratch_buffer = np.empty(size, dtype=np.float32)
+    return _scratch_buffer[:size]
+
+def get_local_coords(obj, buffer):
+    """Get the local coordinates bounding a mesh object, with its world matrix.
+    
+    If the world matrix only scales, flips or swaps the axes, the transformed
+    8 corners of obj.bound_box bound the vertices exactly, so only those are
+    returned. Otherwise the vertex coordinates are read into buffer with a
+    single foreach_get.
+    
+    Args:
+        obj: Mesh object, evaluated if modifiers should be included
+        buffer: float32 scratch array with room for at least 3 values per vertex
+    
+    Returns:
+        Tuple of (coords, matrix_world) arrays, where coords may be a view of
+        buffer, or None if the mesh has no vertices
+    """
+    mesh = obj.data
+    num_verts = len(mesh.vertices)
+    if num_verts == 0:
+        return None
+    
+    matrix_world = np.array(obj.matrix_world, dtype=np.float32)
+    
+    if (np.count_nonzero(matrix_world[:3, :3], axis=1) <= 1).all():
+        coords = np.array(obj.bound_box, dtype=np.float32)
+    else:
+        coords = buffer[:num_verts * 3].reshape(-1, 3)
+        mesh.vertices.foreach_get("co", coords.ravel())
+    
+    return coords, matrix_world
+
+def get_transformed_bounds(coords, matrix_world):
+    """Get the (min, max) of coords transformed by matrix_world, in one matrix product.
+    
+    Only works on numpy arrays, so it is safe to call from worker threads.
+    """
+    world_coords = coords @ matrix_world[:3, :3].T + matrix_world[:3, 3]
+    return world_coords.min(axis=0), world_coords.max(axis=0)
+
+if numba is not None:
+    @numba.njit(parallel=True)
+    def transformed_bounds_kernel(coords, matrix_world):
+        """Get the (min, max) of coords transformed by matrix_world in a single pass.
         
-        # Generate a unique color based on collection name hash
-        import hashlib
-        hash_val = int(hashlib.md5(collection.name.encode()).hexdigest(), 16)
-        r = ((hash_val & 0xFF0000) >> 16) / 255.0
-        g = ((hash_val & 0x00FF00) >> 8) / 255.0
-        b = (hash_val & 0x0000FF) / 255.0
+        Every coordinate is transformed and reduced on the fly, so no world-space
+        copy of the mesh is made.
+        """
+        num_coords = coords.shape[0]
+        num_chunks = min(numba.get_num_threads(), num_coords)
+        chunk_size = (num_coords + num_chunks - 1) // num_chunks
+        chunk_min = np.full((num_chunks, 3), np.inf, dtype=coords.dtype)
+        chunk_max = np.full((num_chunks, 3), -np.inf, dtype=coords.dtype)
         
-        mat.diffuse_color = (r, g, b, 1.0)
-        bbox_obj.data.materials.append(mat)
-    else:
-        bbox_obj.data.materials.append(bpy.data.materials[f"BBox_Material_{collection.name}"])
-    
-    # Store the bounding box dimensions as custom properties
-    bbox_obj["min_x"] = min_co.x
-    bbox_obj["min_y"] = min_co.y
-    bbox_obj["min_z"] = min_co.z
-    bbox_obj["max_x"] = max_co.x
-    bbox_obj["max_y"] = max_co.y
-    bbox_obj["max_z"] = max_co.z
-    bbox_obj["center_x"] = (min_co.x + max_co.x) / 2
-    bbox_obj["center_y"] = (min_co.y + max_co.y) / 2
-    bbox_obj["center_z"] = (min_co.z + max_co.z) / 2
-    bbox_obj["width"] = max_co.x - min_co.x
-    bbox_obj["height"] = max_co.y - min_co.y
-    bbox_obj["depth"] = max_co.z - min_co.z
-    
-    print(f"  Created bounding box for collection: {collection.name}")
-    return bbox_obj
+        # Every chunk is reduced by a single thread, so no atomics are needed
+        for c in numba.prange(num_chunks):
+            for i in range(c * chunk_size, min((c + 1) * chunk_size, num_coords)):
+                for j in range(3):
+                    co = (matrix_world[j, 0] * coords[i, 0] + matrix_world[j, 1] * coords[i, 1]
+                          + matrix_world[j, 2] * coords[i, 2] + matrix_world[j, 3])
+                    chunk_min[c, j] = min(chunk_min[c, j], co)
+                    chunk_max[c, j] = max(chunk_max[c, j], co)
+        
+        # Combine the chunks
+        min_co = chunk_min[0].copy()
+        max_co = chunk_max[0].copy()
+        for c in range(1, num_chunks):
+            for j in range(3):
+                min_co[j] = min(min_co[j], chunk_min[c, j])
+                max_co[j] = max(max_co[j], chunk_max[c, j])
+        
+        return min_co, max_co
+else:
+    transformed_bounds_kernel = None
+
+def get_bbox_material():
+    """Get the material shared by all bounding boxes, creating it if needed.
+    
+    The material takes its color from the Object Info node, so every box is
+    rendered in its own object color. In the viewport, the object color shows
+    with the 'Object' color type of solid shading.
+    """
+    mat = bpy.data.materials.get(BBOX_MATERIAL_NAME)
+    if mat is None:
+        mat = bpy.data.materials.new(BBOX_MATERIAL_NAME)
+        mat.use_nodes = True
+        nodes = mat.node_tree.nodes
+        bsdf = nodes.get("Principled BSDF")
+        if bsdf is not None:
+            object_info = nodes.new('ShaderNodeObjectInfo')
+            mat.node_tree.links.new(object_info.outputs["Color"], bsdf.inputs["Base Color"])
+    return mat
 
-def create_orthographic_cameras(collection, bbox_obj, camera_collection):
-    """Create orthographic cameras for X, Y, and Z views of the bounding box."""
+def create_orthographic_cameras(collection, min_co, max_co, camera_collection):
+    """Create orthographic cameras for X, Y, and Z views of the bounds from min_co to max_co."""
     # Get bounding box dimensions
-    min_x = bbox_obj["min_x"]
-    min_y = bbox_obj["min_y"]
-    min_z = bbox_obj["min_z"]
-    max_x = bbox_obj["max_x"]
-    max_y = bbox_obj["max_y"]
-    max_z = bbox_obj["max_z"]
-    center_x = bbox_obj["center_x"]
-    center_y = bbox_obj["center_y"]
-    center_z = bbox_obj["center_z"]
-    width = bbox_obj["width"]
-    height = bbox_obj["height"]
-    depth = bbox_obj["depth"]
+    min_x, min_y, min_z = min_co
+    max_x, max_y, max_z = max_co
+    center_x = (min_x + max_x) / 2
+    center_y = (min_y + max_y) / 2
+    center_z = (min_z + max_z) / 2
+    width = max_x - min_x
+    height = max_y - min_y
+    depth = max_z - min_z
     
     # Calculate camera distance (add some padding)
     padding = 1.2  # 20% padding
@@ -223,9 +384,8 @@ def create_orthographic_cameras(collection, bbox_obj, camera_collection):
     
     # Create a collection for this collection's cameras
     camera_group_name = f"Cameras_{collection.name}"
-    if camera_group_name in bpy.data.collections:
-        camera_group = bpy.data.collections[camera_group_name]
-    else:
+    camera_group = bpy.data.collections.get(camera_group_name)
+    if camera_group is None:
         camera_group = bpy.data.collections.new(camera_group_name)
         camera_collection.children.link(camera_group)
     
@@ -233,7 +393,7 @@ def create_orthographic_cameras(collection, bbox_obj, camera_collection):
     create_camera(
         f"Camera_X_{collection.name}",
         (max_x + max_dimension, center_y, center_z),
-        (center_x, center_y, center_z),
+        CAMERA_X_ROTATION,
         max(height, depth),
         camera_group
     )
@@ -242,7 +402,7 @@ def create_orthographic_cameras(collection, bbox_obj, camera_collection):
     create_camera(
         f"Camera_Y_{collection.name}",
         (center_x, max_y + max_dimension, center_z),
-        (center_x, center_y, center_z),
+        CAMERA_Y_ROTATION,
         max(width, depth),
         camera_group
     )
@@ -251,18 +411,22 @@ def create_orthographic_cameras(collection, bbox_obj, camera_collection):
     create_camera(
         f"Camera_Z_{collection.name}",
         (center_x, center_y, max_z + max_dimension),
-        (center_x, center_y, center_z),
+        CAMERA_Z_ROTATION,
         max(width, height),
         camera_group
     )
     
-    print(f"  Created orthographic cameras for collection: {collection.name}")
+    if VERBOSE:
+        print(f"  Created orthographic cameras for collection: {collection.name}")
 
-def create_camera(name, location, target, ortho_scale, collection):
-    """Create an orthographic camera at the specified location, looking at the target."""
+def create_camera(name, location, rotation, ortho_scale, collection):
+    """Create an orthographic camera at the specified location with the given rotation."""
+    data_objects = bpy.data.objects
+    
     # Remove existing camera if it exists
-    if name in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[name])
+    existing = data_objects.get(name)
+    if existing is not None:
+        data_objects.remove(existing)
     
     # Create camera data
     cam_data = bpy.data.cameras.new(name)
@@ -270,22 +434,47 @@ def create_camera(name, location, target, ortho_scale, collection):
     cam_data.ortho_scale = ortho_scale  # Set the orthographic scale
     
     # Create camera object
-    cam_obj = bpy.data.objects.new(name, cam_data)
+    cam_obj = data_objects.new(name, cam_data)
     cam_obj.location = location
     
-    # Point camera at target
-    direction = Vector(target) - Vector(location)
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    cam_obj.rotation_euler = rot_quat.to_euler()
+    cam_obj.rotation_euler = rotation
     
-    # Link to scene temporarily and then to the collection
-    bpy.context.scene.collection.objects.link(cam_obj)
-    bpy.context.scene.collection.objects.unlink(cam_obj)
+    # Link straight to the collection
     collection.objects.link(cam_obj)
     
     return cam_obj
 
-def render_visualization_cameras(output_dir=None, clear_existing=True):
+def remove_datablocks(datablocks, data_collection):
+    """Remove datablocks of one type, all at once where Blender supports it.
+    
+    bpy.data.batch_remove (Blender 2.93+) removes the whole list in a single
+    pass; older versions remove them one at a time from data_collection, the
+    bpy.data collection they belong to.
+    """
+    if not datablocks:
+        return
+    
+    batch_remove = getattr(bpy.data, 'batch_remove', None)
+    if batch_remove is not None:
+        batch_remove(ids=datablocks)
+    else:
+        for datablock in datablocks:
+            data_collection.remove(datablock)
+
+@contextmanager
+def batched_updates():
+    """Update the view layer once after a block of bulk datablock changes.
+    
+    Nothing inside the block should force an update of its own; the view layer
+    is updated a single time on exit, so the code after it sees the new objects
+    evaluated.
+    """
+    try:
+        yield
+    finally:
+        bpy.context.view_layer.update()
+
+def render_visualization_cameras(output_dir=None, clear_existing=True, num_processes=1, force=False):
     """
     Render images from all cameras in the Collection_Visualization collection.
     Ignores collections with 'base' in their name.
@@ -294,182 +483,179 @@ def render_visualization_cameras(output_dir=None, clear_existing=True):
         output_dir (str, optional): Directory to save rendered images.
                                     If None, uses the default Blender output path.
         clear_existing (bool): Whether to remove all existing cameras and bounding boxes before rendering.
+        num_processes (int): Number of background Blender processes to render with.
+                             With 1, all cameras are rendered in this session.
+        force (bool): Whether to rebuild every bounding box and its cameras. Otherwise those
+                      whose stored bounds still match the collection are kept as they are.
     """
-    # Clear existing cameras and bounding boxes if requested
-    if clear_existing:
-        # First, try to remove the entire Collection_Visualization if it exists
-        if "Collection_Visualization" in bpy.data.collections:
-            viz_collection = bpy.data.collections["Collection_Visualization"]
-            
-            # Recursively remove all objects from the collection and its children
-            def remove_objects_from_collection(collection):
-                # Remove all objects in this collection
-                for obj in list(collection.objects):  # Create a copy of the list to avoid modification during iteration
-                    bpy.data.objects.remove(obj, do_unlink=True)
-                
-                # Process child collections
-                for child in list(collection.children):  # Create a copy of the list
-                    remove_objects_from_collection(child)
-                    # After removing all objects, remove the child collection
-                    bpy.data.collections.remove(child)
-            
-            # Remove all objects and child collections
-            remove_objects_from_collection(viz_collection)
-            
-            # Now remove the visualization collection itself
-            bpy.data.collections.remove(viz_collection)
-            print("Removed Collection_Visualization and all its contents")
-        
-        # As a fallback, also look for any stray bounding boxes or cameras that might not be in the collection
-        # Remove bounding boxes (objects with names starting with "BBox_")
-        bbox_to_remove = [obj for obj in bpy.data.objects if obj.name.startswith("BBox_")]
-        for bbox in bbox_to_remove:
-            print(f"Removing stray bounding box: {bbox.name}")
-            bpy.data.objects.remove(bbox, do_unlink=True)
+    data_objects = bpy.data.objects
+    collections = bpy.data.collections
+    
+    # Collections with 'base' in their name, matched once for both traversals
+    skipped = {collection for collection in collections if 'base' in collection.name.lower()}
+    
+    # Gather all collections starting from the scene collection, depth-first
+    # with an explicit stack; children are pushed in reverse so they pop in order.
+    # The visualization collection is left out so boxes never get boxes of their own
+    viz_collection = collections.get("Collection_Visualization")
+    candidates = []
+    stack = [bpy.context.scene.collection]
+    while stack:
+        collection = stack.pop()
         
-        # Remove cameras
-        cameras_to_remove = [obj for obj in bpy.data.objects if obj.type == 'CAMERA' and obj.name.startswith(("Camera_X_", "Camera_Y_", "Camera_Z_"))]
-        for camera in cameras_to_remove:
-            print(f"Removing stray camera: {camera.name}")
-            bpy.data.objects.remove(camera, do_unlink=True)
+        # Skip collections with 'base' in their name, along with their children
+        if collection in skipped:
+            if VERBOSE:
+                print(f"Skipping collection: {collection.name} (contains 'base')")
+            continue
         
-        # Clean up camera data blocks
-        for camera in list(bpy.data.cameras):
-            if camera.name.startswith(("Camera_X_", "Camera_Y_", "Camera_Z_")):
-                bpy.data.cameras.remove(camera)
+        if collection == viz_collection:
+            continue
         
-        # Clean up materials created for bounding boxes
-        for material in list(bpy.data.materials):
-            if material.name.startswith("BBox_Material_"):
-                bpy.data.materials.remove(material)
-        
-        print(f"Cleanup complete: removed {len(bbox_to_remove)} stray bounding boxes and {len(cameras_to_remove)} stray cameras")
-    
-    # Create visualization collection structure
-    print("\nCreating visualization collection structure...")
-    
-    # Create or get the visualization collection
-    if "Collection_Visualization" not in bpy.data.collections:
-        viz_collection = bpy.data.collections.new("Collection_Visualization")
-        bpy.context.scene.collection.children.link(viz_collection)
-    else:
-        viz_collection = bpy.data.collections["Collection_Visualization"]
-    
-    # Create or get the bounding boxes collection
-    if "BoundingBoxes" not in bpy.data.collections:
-        bbox_collection = bpy.data.collections.new("BoundingBoxes")
-        viz_collection.children.link(bbox_collection)
-    else:
-        bbox_collection = bpy.data.collections["BoundingBoxes"]
-    
-    # Create or get the cameras collection
-    if "OrthoCameras" not in bpy.data.collections:
-        camera_collection = bpy.data.collections.new("OrthoCameras")
-        viz_collection.children.link(camera_collection)
-    else:
-        camera_collection = bpy.data.collections["OrthoCameras"]
-    
-    # Create bounding boxes for all collections with mesh objects
-    print("Creating bounding boxes for collections...")
-    created_bboxes = []
-    
-    def process_collection_for_bbox(collection):
-        # Skip collections with 'base' in their name
-        if 'base' in collection.name.lower():
-            print(f"Skipping collection: {collection.name} (contains 'base')")
-            return
-        
-        # Create bounding box for this collection
-        bbox_obj = create_bounding_box(collection, bbox_collection)
-        if bbox_obj:
-            created_bboxes.append((collection, bbox_obj))
+        candidates.append(collection)
         
         # Process child collections
-        for child in collection.children:
-            process_collection_for_bbox(child)
-    
-    # Process all collections starting from the scene collection
-    process_collection_for_bbox(bpy.context.scene.collection)
-    
-    print(f"Created {len(created_bboxes)} bounding boxes")
-    
-    # Create cameras for each bounding box
-    print("Creating cameras for bounding boxes...")
-    for collection, bbox_obj in created_bboxes:
-        # Create a collection for this collection's cameras
-        camera_group_name = f"Cameras_{collection.name}"
-        if camera_group_name in bpy.data.collections:
-            camera_group = bpy.data.collections[camera_group_name]
-        else:
-            camera_group = bpy.data.collections.new(camera_group_name)
-            camera_collection.children.link(camera_group)
+        stack.extend(reversed(collection.children))
+    
+    # Compute the bounds of all collections in one batch, before any cleanup, so
+    # that boxes which are still up to date can be told apart
+    collection_bounds = get_collections_bounds(candidates)
+    unchanged = set() if force else {collection for collection, bounds in collection_bounds.items()
+                                     if is_bounding_box_current(collection, *bounds)}
+    
+    # Keep the boxes and cameras of unchanged collections, with the collections holding them
+    kept_objects = {data_objects[f"{prefix}{collection.name}"] for collection in unchanged
+                    for prefix in ("BBox_", "Camera_X_", "Camera_Y_", "Camera_Z_")}
+    kept_collections = {"Collection_Visualization", "BoundingBoxes", "OrthoCameras"} if unchanged else set()
+    kept_collections.update(f"Cameras_{collection.name}" for collection in unchanged)
+    
+    # Batch the cleanup and creation into a single scene update
+    with batched_updates():
+        # Clear existing cameras and bounding boxes if requested
+        if clear_existing:
+            # First, gather the entire Collection_Visualization if it exists
+            nested = []
+            if viz_collection is not None:
+                # Gather the collection and all its descendants; a collection
+                # linked under several parents is only kept once
+                stack = [viz_collection]
+                while stack:
+                    collection = stack.pop()
+                    nested.append(collection)
+                    stack.extend(collection.children)
+                nested = list(dict.fromkeys(nested))
+            
+            # All objects in the collection and its children
+            objects_to_remove = dict.fromkeys(obj for collection in nested for obj in collection.objects
+                                              if obj not in kept_objects)
+            
+            # As a fallback, also look for any stray bounding boxes or cameras that might not be in the collection
+            # Bounding boxes (objects with names starting with "BBox_")
+            bbox_to_remove = [obj for obj in data_objects
+                              if obj.name.startswith("BBox_") and obj not in objects_to_remove
+                              and obj not in kept_objects]
+            
+            # Cameras
+            cameras_to_remove = [obj for obj in data_objects
+                                 if obj.type == 'CAMERA' and obj.name.startswith(("Camera_X_", "Camera_Y_", "Camera_Z_"))
+                                 and obj not in objects_to_remove and obj not in kept_objects]
+            
+            if VERBOSE:
+                for bbox in bbox_to_remove:
+                    print(f"Removing stray bounding box: {bbox.name}")
+                for camera in cameras_to_remove:
+                    print(f"Removing stray camera: {camera.name}")
+            
+            # Remove all the objects, then the collections, in bulk
+            remove_datablocks([*objects_to_remove, *bbox_to_remove, *cameras_to_remove], data_objects)
+            nested = [collection for collection in nested if collection.name not in kept_collections]
+            if nested:
+                # Check before removal, as a removed collection can no longer be read
+                removed_viz = "Collection_Visualization" not in kept_collections
+                # Children before their parents, for removal one at a time
+                remove_datablocks(nested[::-1], collections)
+                if removed_viz:
+                    print("Removed Collection_Visualization and all its contents")
+                else:
+                    print(f"Removed {len(nested)} outdated collections from Collection_Visualization")
+            
+            # Clean up the camera data blocks left without cameras
+            remove_datablocks([camera for camera in bpy.data.cameras
+                               if camera.users == 0 and camera.name.startswith(("Camera_X_", "Camera_Y_", "Camera_Z_"))],
+                              bpy.data.cameras)
+            
+            # Clean up the per-collection materials of older bounding boxes; the
+            # shared material is kept for the new ones
+            remove_datablocks([material for material in bpy.data.materials
+                               if material.name.startswith("BBox_Material_") and material.name != BBOX_MATERIAL_NAME],
+                              bpy.data.materials)
+            
+            print(f"Cleanup complete: removed {len(bbox_to_remove)} stray bounding boxes and {len(cameras_to_remove)} stray cameras")
         
-        # Get bounding box dimensions
-        min_x = bbox_obj["min_x"]
-        min_y = bbox_obj["min_y"]
-        min_z = bbox_obj["min_z"]
-        max_x = bbox_obj["max_x"]
-        max_y = bbox_obj["max_y"]
-        max_z = bbox_obj["max_z"]
-        center_x = bbox_obj["center_x"]
-        center_y = bbox_obj["center_y"]
-        center_z = bbox_obj["center_z"]
-        width = bbox_obj["width"]
-        height = bbox_obj["height"]
-        depth = bbox_obj["depth"]
+        # Create visualization collection structure
+        print("\nCreating visualization collection structure...")
         
-        # Calculate camera distance (add some padding)
-        padding = 1.2  # 20% padding
-        max_dimension = max(width, height, depth) * padding
+        # Create or get the visualization collection
+        viz_collection = collections.get("Collection_Visualization")
+        if viz_collection is None:
+            viz_collection = collections.new("Collection_Visualization")
+            bpy.context.scene.collection.children.link(viz_collection)
         
-        # Create X-axis camera (looking from +X to -X)
-        create_camera(
-            f"Camera_X_{collection.name}",
-            (max_x + max_dimension, center_y, center_z),
-            (center_x, center_y, center_z),
-            max(height, depth),
-            camera_group
-        )
+        # Create or get the bounding boxes collection
+        bbox_collection = collections.get("BoundingBoxes")
+        if bbox_collection is None:
+            bbox_collection = collections.new("BoundingBoxes")
+            viz_collection.children.link(bbox_collection)
         
-        # Create Y-axis camera (looking from +Y to -Y)
-        create_camera(
-            f"Camera_Y_{collection.name}",
-            (center_x, max_y + max_dimension, center_z),
-            (center_x, center_y, center_z),
-            max(width, depth),
-            camera_group
-        )
+        # Create or get the cameras collection
+        camera_collection = collections.get("OrthoCameras")
+        if camera_collection is None:
+            camera_collection = collections.new("OrthoCameras")
+            viz_collection.children.link(camera_collection)
         
-        # Create Z-axis camera (looking from +Z to -Z)
-        create_camera(
-            f"Camera_Z_{collection.name}",
-            (center_x, center_y, max_z + max_dimension),
-            (center_x, center_y, center_z),
-            max(width, height),
-            camera_group
-        )
+        # Create bounding boxes for all collections with mesh objects
+        print("Creating bounding boxes and cameras for collections...")
+        num_bboxes = 0
         
-        print(f"Created cameras for collection: {collection.name}")
+        # Create the boxes and their cameras together while the bounds are at hand
+        for collection in candidates:
+            bounds = collection_bounds.get(collection)
+            if bounds is None:
+                if VERBOSE:
+                    print(f"  No visible mesh objects in collection: {collection.name}")
+                continue
+            
+            if collection in unchanged:
+                if VERBOSE:
+                    print(f"  Bounding box is up to date for collection: {collection.name}")
+                continue
+            
+            create_bounding_box(collection, bbox_collection, *bounds)
+            create_orthographic_cameras(collection, *bounds, camera_collection)
+            num_bboxes += 1
+        
+        print(f"Created {num_bboxes} bounding boxes with cameras, kept {len(unchanged)} up to date")
     
     # Find all cameras in the visualization collection and its children
     cameras = []
     
-    def find_cameras_in_collection(collection):
-        # Skip collections with 'base' in their name
-        if 'base' in collection.name.lower():
-            return
-            
+    stack = [viz_collection]
+    while stack:
+        collection = stack.pop()
+        
+        # Skip collections with 'base' in their name, along with their children
+        if collection in skipped:
+            continue
+        
         # Add cameras directly in this collection
         for obj in collection.objects:
             if obj.type == 'CAMERA':
                 cameras.append(obj)
-                print(f"Found camera: {obj.name} in collection: {collection.name}")
+                if VERBOSE:
+                    print(f"Found camera: {obj.name} in collection: {collection.name}")
         
-        # Recursively check child collections
-        for child in collection.children:
-            find_cameras_in_collection(child)
-    
-    find_cameras_in_collection(viz_collection)
+        # Check child collections
+        stack.extend(reversed(collection.children))
     
     if not cameras:
         print("No cameras found in Collection_Visualization or its child collections")
@@ -484,29 +670,159 @@ def render_visualization_cameras(output_dir=None, clear_existing=True):
         # Ensure the directory exists
         os.makedirs(output_dir, exist_ok=True)
     
-    # Store original render settings
-    original_filepath = bpy.context.scene.render.filepath
-    original_camera = bpy.context.scene.camera
+    if num_processes > 1 and len(cameras) > 1:
+        # Split the cameras across background Blender processes
+        render_cameras_in_background(cameras, output_dir, num_processes)
+    else:
+        # Render all cameras in a single animation render
+        render_cameras(bpy.context.scene, cameras, output_dir)
+    
+    print(f"Rendering complete. {len(cameras)} images saved to {output_dir}")
+
+def render_cameras(scene, cameras, output_dir):
+    """Render every camera to output_dir, as one image named after the camera.
     
-    # Render each camera
-    for i, camera in enumerate(cameras):
-        print(f"Rendering camera {i+1}/{len(cameras)}: {camera.name}")
+    The cameras are bound to frames 1..N with timeline markers and rendered
+    as one animation, so the render engine only starts up once. The frame
+    images are then renamed after their cameras.
+    
+    Camera i is rendered at frame i rather than the current frame, so scenes
+    that can change from frame to frame (see is_scene_animated), and movie
+    output formats that would write a single video, are rendered one still
+    per camera at the current frame instead.
+    """
+    render = scene.render
+    if render.is_movie_format or is_scene_animated(scene):
+        render_camera_stills(scene, cameras, output_dir)
+        return
+    
+    markers = scene.timeline_markers
+    
+    # Store original render settings
+    original_settings = (render.filepath, render.use_lock_interface, scene.camera,
+                         scene.frame_start, scene.frame_end, scene.frame_step)
+    
+    # Existing camera markers would fight ours for the active camera
+    bound_markers = [(marker, marker.camera) for marker in markers if marker.camera is not None]
+    for marker, _ in bound_markers:
+        marker.camera = None
+    
+    camera_markers = []
+    try:
+        # Switch to the next camera on every frame
+        for frame, camera in enumerate(cameras, start=1):
+            marker = markers.new(f"Render_{camera.name}", frame=frame)
+            marker.camera = camera
+            camera_markers.append(marker)
+        
+        scene.camera = cameras[0]
+        scene.frame_start = 1
+        scene.frame_end = len(cameras)
+        scene.frame_step = 1
+        render.filepath = os.path.join(output_dir, "Camera_####")
         
-        # Set the active camera
-        bpy.context.scene.camera = camera
+        # Keep the interface from touching scene data while rendering
+        render.use_lock_interface = True
         
-        # Set output path for this camera
-        camera_filename = f"{camera.name}.png"
-        bpy.context.scene.render.filepath = os.path.join(output_dir, camera_filename)
+        print(f"Rendering {len(cameras)} cameras as frames 1-{len(cameras)}")
+        bpy.ops.render.render(animation=True)
         
-        # Render the image
-        bpy.ops.render.render(write_still=True)
+        # Name every frame image after its camera
+        for frame, camera in enumerate(cameras, start=1):
+            frame_path = render.frame_path(frame=frame)
+            if os.path.exists(frame_path):
+                extension = os.path.splitext(frame_path)[1]
+                os.replace(frame_path, os.path.join(os.path.dirname(frame_path), camera.name + extension))
+    finally:
+        # Restore original settings
+        for marker in camera_markers:
+            markers.remove(marker)
+        for marker, camera in bound_markers:
+            marker.camera = camera
+        (render.filepath, render.use_lock_interface, scene.camera,
+         scene.frame_start, scene.frame_end, scene.frame_step) = original_settings
+
+def render_camera_stills(scene, cameras, output_dir):
+    """Render every camera to output_dir at the current frame, one still at a time.
     
-    # Restore original settings
-    bpy.context.scene.render.filepath = original_filepath
-    bpy.context.scene.camera = original_camera
+    Movie output formats cannot write stills, so PNG is used with them.
+    """
+    render = scene.render
+    image_settings = render.image_settings
     
-    print(f"Rendering complete. {len(cameras)} images saved to {output_dir}")
+    # Store original render settings
+    original_settings = (render.filepath, scene.camera, image_settings.file_format)
+    
+    try:
+        if render.is_movie_format:
+            image_settings.file_format = 'PNG'
+        
+        for i, camera in enumerate(cameras):
+            print(f"Rendering camera {i+1}/{len(cameras)}: {camera.name}")
+            scene.camera = camera
+            render.filepath = os.path.join(output_dir, camera.name)
+            bpy.ops.render.render(write_still=True)
+    finally:
+        # Restore original settings
+        render.filepath, scene.camera, image_settings.file_format = original_settings
+
+def is_scene_animated(scene):
+    """Whether the scene can look different from one frame to the next.
+    
+    True if frame change handlers are registered, or if the scene or any
+    datablock has animation data with an action, drivers or NLA tracks.
+    """
+    handlers = bpy.app.handlers
+    if handlers.frame_change_pre or handlers.frame_change_post:
+        return True
+    
+    data = bpy.data
+    for datablocks in ([scene], data.objects, data.meshes, data.curves, data.materials, data.worlds,
+                       data.lights, data.cameras, data.shape_keys, data.node_groups):
+        for datablock in datablocks:
+            animation_data = datablock.animation_data
+            if animation_data is not None and (animation_data.action is not None
+                                               or len(animation_data.drivers) > 0
+                                               or len(animation_data.nla_tracks) > 0):
+                return True
+    return False
+
+def render_cameras_in_background(cameras, output_dir, num_processes):
+    """Render every camera to output_dir using several background Blender processes.
+    
+    A copy of the current file is saved to a temporary directory and each
+    process opens it and renders its share of the cameras, one still per
+    camera, named after the camera.
+    """
+    # Resolve the output directory against the current file, not the copy
+    output_dir = bpy.path.abspath(output_dir)
+    jobs = [(camera.name, os.path.join(output_dir, f"{camera.name}.png")) for camera in cameras]
+    num_processes = min(num_processes, len(jobs))
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        blend_path = os.path.join(temp_dir, "render_visualization_cameras.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+        
+        # Deal the cameras out round-robin, one script per process
+        commands = []
+        for i in range(num_processes):
+            script = (
+                "import bpy\n"
+                "scene = bpy.context.scene\n"
+                f"for name, path in {jobs[i::num_processes]!r}:\n"
+                "    scene.camera = bpy.data.objects[name]\n"
+                "    scene.render.filepath = path\n"
+                "    bpy.ops.render.render(write_still=True)\n"
+            )
+            commands.append([bpy.app.binary_path, "-b", blend_path, "--python-expr", script])
+        
+        print(f"Rendering {len(jobs)} cameras in {num_processes} background processes")
+        with ThreadPoolExecutor(max_workers=num_processes) as executor:
+            results = list(executor.map(subprocess.run, commands))
+    
+    failed = [i for i, result in enumerate(results) if result.returncode != 0]
+    if failed:
+        print(f"Warning: {len(failed)} of {num_processes} render processes failed")
 
 if __name__ == "__main__":
     # Example usage: Render to a specific directory
@@ -4,22 +4,93 @@ import os
 import glob
 import matplotlib
 import datetime
+from concurrent.futures import ProcessPoolExecutor
 # Use a non-interactive backend to avoid any display issues
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PatchCollection
 
-def analyze_grid(image_path, paper_width_inches):
-    """Process grid image and create PDF with exact 1m drawing width
+def find_line_positions(profile, min_prominence=0.3):
+    """Find the positions of the lines along one axis of a binarized image
+    
+    Every local maximum of the profile that rises above the rows on either
+    side of it by at least min_prominence of the fullest row is a line, as
+    with a prominence in scipy.signal.find_peaks. Neighboring lines are told
+    apart as long as the profile dips between them, even where a drawing
+    lifts all the rows around them.
     
     Args:
-        image_path: Path to the input PNG image
-        paper_width_inches: Width of the paper roll in inches (42 or 44)
+        profile: Number of line pixels in each row (or column) of the image
+        min_prominence: Fraction of the fullest row's pixels a line must stand out by
+    
+    Returns:
+        Sorted list with the center of every line, found once however thick
+        it is drawn
     """
-    print(f"\nAnalyzing {os.path.basename(image_path)} for {paper_width_inches}-inch paper...")
+    profile = np.asarray(profile, dtype=np.int64)
+    if len(profile) == 0 or profile.max() == 0:
+        return []
+    
+    # Collapse runs of equal rows, so that a thick line is a single peak;
+    # the padding lets lines on the image border count as peaks too
+    padded = np.concatenate(([0], profile, [0]))
+    run_starts = np.concatenate(([0], np.flatnonzero(np.diff(padded)) + 1))
+    run_ends = np.concatenate((run_starts[1:], [len(padded)]))
+    values = padded[run_starts]
+    peaks = np.flatnonzero((values[1:-1] > values[:-2]) & (values[1:-1] > values[2:])) + 1
+    
+    min_height = profile.max() * min_prominence
+    positions = []
+    for k in peaks.tolist():
+        value = values[k]
+        
+        # Lowest run on each side before the profile climbs above the peak
+        higher_left = np.flatnonzero(values[:k] > value)
+        higher_right = np.flatnonzero(values[k + 1:] > value)
+        left_min = values[higher_left[-1] + 1 if len(higher_left) else 0:k].min()
+        right_min = values[k + 1:k + 1 + higher_right[0] if len(higher_right) else len(values)].min()
+        
+        if value - max(left_min, right_min) >= min_height:
+            positions.append(int(run_starts[k] + run_ends[k] - 1) // 2 - 1)
     
-    # Convert paper width to cm
-    paper_width_cm = paper_width_inches * 2.54
+    return positions
+
+def find_grid_lines(thresh):
+    """Find the horizontal and vertical grid lines of a binarized image
+    
+    Returns:
+        Tuple of (horizontal_positions, vertical_positions), the sorted pixel
+        rows and columns of the lines
+    """
+    # Use morphology to close small gaps in lines
+    kernel = np.ones((5,5), np.uint8)
+    closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+    
+    # The grid lines are all horizontal or vertical, so project the image onto
+    # each axis: rows and columns on a grid line hold the most line pixels
+    horizontal_positions = find_line_positions(np.count_nonzero(closed, axis=1))
+    vertical_positions = find_line_positions(np.count_nonzero(closed, axis=0))
+    
+    return horizontal_positions, vertical_positions
+
+def detect_grid(image_path):
+    """Detect the grid lines of a grid image
+    
+    The result does not depend on the paper size, so it is computed once per
+    image and shared by all the PDFs generated from it.
+    
+    Args:
+        image_path: Path to the input PNG image
+    
+    Returns:
+        Dict with an RGB view of the image as 'img_rgb', the sorted pixel positions of the
+        grid lines as 'horizontal_positions' and 'vertical_positions', and the
+        median line spacings as 'median_h_spacing' and 'median_v_spacing'
+        (None if they could not be calculated), or None if the image could
+        not be loaded
+    """
+    print(f"\nDetecting grid in {os.path.basename(image_path)}...")
     
     # Load the image
     image = cv2.imread(image_path)
@@ -28,41 +99,96 @@ def analyze_grid(image_path, paper_width_inches):
         print(f"Error: Could not load image {image_path}")
         return None
     
-    # Get a grayscale version for processing
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Binarize the image in one pass over the color pixels: the light background
+    # (every channel above 200) is found, then inverted so the lines are set
+    thresh = cv2.bitwise_not(cv2.inRange(image, (201, 201, 201), (255, 255, 255)))
+    
+    # Try detecting the lines on a copy of at most 1024 pixels a side first. The
+    # binarized image is shrunk rather than the grayscale one, and area interpolation
+    # leaves a trace of every line pixel, so thin lines are not averaged away
+    horizontal_positions = vertical_positions = None
+    scale = 1024 / max(thresh.shape)
+    if scale < 1:
+        small = cv2.resize(thresh, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        _, small = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY)
+        small_h_positions, small_v_positions = find_grid_lines(small)
+        
+        # A dense grid closes up solid on the small copy, so only trust it when its
+        # lines are spaced well apart: at least 4 times the 5 pixel closing kernel
+        if all(len(positions) > 1 and np.median(np.diff(positions)) >= 20
+               for positions in (small_h_positions, small_v_positions)):
+            # Scale the positions back up to pixels of the full-size image
+            row_scale = thresh.shape[0] / small.shape[0]
+            col_scale = thresh.shape[1] / small.shape[1]
+            horizontal_positions = [round((y + 0.5) * row_scale - 0.5) for y in small_h_positions]
+            vertical_positions = [round((x + 0.5) * col_scale - 0.5) for x in small_v_positions]
+    
+    if horizontal_positions is None:
+        horizontal_positions, vertical_positions = find_grid_lines(thresh)
     
-    # Apply threshold to binarize the image
-    _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
-
-    # Use morphology to close small gaps in lines
-    kernel = np.ones((5,5), np.uint8)
-    closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-
-    # Detect edges
-    edges = cv2.Canny(closed, 50, 150, apertureSize=3)
-
-    # Use Hough Line Transform to detect lines
-    lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=100, minLineLength=100, maxLineGap=10)
-
-    horizontal_lines = []
-    vertical_lines = []
-
-    if lines is not None:
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            if abs(y2 - y1) < 10:  # Horizontal line
-                horizontal_lines.append((y1, y2))
-            elif abs(x2 - x1) < 10:  # Vertical line
-                vertical_lines.append((x1, x2))
+    # More robust grid estimator with statistical validation to enforce metric correctness
+    # First, calculate all grid line spacings to find the most consistent spacing
+    horizontal_spacings = np.diff(horizontal_positions)
+    horizontal_spacings = horizontal_spacings[horizontal_spacings > 10]  # Filter out noise/too close lines
+    
+    vertical_spacings = np.diff(vertical_positions)
+    vertical_spacings = vertical_spacings[vertical_spacings > 10]  # Filter out noise/too close lines
+    
+    # Calculate median spacing to get the most reliable grid cell size
+    if horizontal_spacings.size > 0 and vertical_spacings.size > 0:
+        # Use median for robustness against outliers
+        median_h_spacing = float(np.median(horizontal_spacings))
+        median_v_spacing = float(np.median(vertical_spacings))
+        
+        # Validate grid spacing consistency - print warnings if inconsistent;
+        # all spacings are over 10 pixels, so the means are never 0
+        h_cv = horizontal_spacings.std() / horizontal_spacings.mean()
+        v_cv = vertical_spacings.std() / vertical_spacings.mean()
+        
+        if h_cv > 0.2 or v_cv > 0.2:  # Coefficient of variation > 20% indicates inconsistency
+            print(f"WARNING: Grid spacing is inconsistent. CV: h={h_cv:.2f}, v={v_cv:.2f}")
+            print(f"Horizontal spacings: min={horizontal_spacings.min():.1f}, max={horizontal_spacings.max():.1f}, median={median_h_spacing:.1f}")
+            print(f"Vertical spacings: min={vertical_spacings.min():.1f}, max={vertical_spacings.max():.1f}, median={median_v_spacing:.1f}")
+    else:
+        # Left for the PDF to fall back on the cell size of its image
+        print("WARNING: Could not calculate reliable grid spacing")
+        median_h_spacing = None
+        median_v_spacing = None
+    
+    return {
+        'img_rgb': image[..., ::-1],  # RGB view of the BGR pixels, without a copy
+        'horizontal_positions': horizontal_positions,
+        'vertical_positions': vertical_positions,
+        'median_h_spacing': median_h_spacing,
+        'median_v_spacing': median_v_spacing
+    }
 
-    # Extract unique horizontal and vertical positions
-    horizontal_positions = sorted(set([y for y1, y2 in horizontal_lines for y in (y1, y2)]))
-    vertical_positions = sorted(set([x for x1, x2 in vertical_lines for x in (x1, x2)]))
+def render_pdf(image_path, grid, paper_width_inches):
+    """Create PDF with exact 1m drawing width from a detected grid
+    
+    Args:
+        image_path: Path to the input PNG image
+        grid: Grid detected in the image, as returned by detect_grid
+        paper_width_inches: Width of the paper roll in inches (42 or 44)
+    """
+    print(f"\nGenerating {os.path.basename(image_path)} for {paper_width_inches}-inch paper...")
+    
+    # Convert paper width to cm
+    paper_width_cm = paper_width_inches * 2.54
+    
+    # Grid line positions detected in the image
+    horizontal_positions = grid['horizontal_positions']
+    vertical_positions = grid['vertical_positions']
 
     # Count rows and columns
     num_rows = len(horizontal_positions) - 1 if len(horizontal_positions) > 1 else 0
     num_cols = len(vertical_positions) - 1 if len(vertical_positions) > 1 else 0
     
+    # Without a whole cell in both directions there is nothing to scale
+    if num_rows == 0 or num_cols == 0:
+        print(f"Error: No grid found in {os.path.basename(image_path)} ({num_rows} rows × {num_cols} columns)")
+        return None
+    
     # Calculate width and length in meters (assuming each cell is 10cm x 10cm)
     width_meters = num_cols * 0.1
     length_meters = num_rows * 0.1
@@ -123,12 +249,11 @@ def analyze_grid(image_path, paper_width_inches):
     print(f"Rotation: {need_rotation}")
     print(f"Generating: {pdf_filename}")
     
-    # Convert BGR to RGB
-    img_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    img_rgb = grid['img_rgb']
     
     # If rotation is needed for the printer, rotate the image
     if need_rotation:
-        img_rgb = cv2.rotate(img_rgb, cv2.ROTATE_90_CLOCKWISE)
+        img_rgb = np.rot90(img_rgb, k=-1)  # Clockwise, as a view
     
     # Calculate exact figure size
     total_width_cm = paper_width_cm
@@ -154,9 +279,10 @@ def analyze_grid(image_path, paper_width_inches):
     drawing_bottom = bottom_margin_norm
     drawing_top = bottom_margin_norm + height_norm
     
-    # Place image
+    # Place image; without interpolation the PDF embeds the image as it is,
+    # rather than resampling it to 300 dpi over the whole drawing
     img_ax = fig.add_axes([left_margin_norm, bottom_margin_norm, width_norm, height_norm])
-    img_ax.imshow(img_rgb)
+    img_ax.imshow(img_rgb, interpolation='none')
     img_ax.set_xticks([])
     img_ax.set_yticks([])
     
@@ -166,42 +292,11 @@ def analyze_grid(image_path, paper_width_inches):
     img_ax.spines['bottom'].set_linewidth(1.5)
     img_ax.spines['left'].set_linewidth(1.5)
     
-    # More robust grid estimator with statistical validation to enforce metric correctness
-    # First, calculate all grid line spacings to find the most consistent spacing
-    horizontal_spacings = []
-    for i in range(1, len(horizontal_positions)):
-        spacing = horizontal_positions[i] - horizontal_positions[i-1]
-        if spacing > 10:  # Filter out noise/too close lines
-            horizontal_spacings.append(spacing)
-    
-    vertical_spacings = []
-    for i in range(1, len(vertical_positions)):
-        spacing = vertical_positions[i] - vertical_positions[i-1]
-        if spacing > 10:  # Filter out noise/too close lines
-            vertical_spacings.append(spacing)
-    
-    # Calculate median spacing to get the most reliable grid cell size
-    if len(horizontal_spacings) > 0 and len(vertical_spacings) > 0:
-        # Use median for robustness against outliers
-        median_h_spacing = sorted(horizontal_spacings)[len(horizontal_spacings)//2]
-        median_v_spacing = sorted(vertical_spacings)[len(vertical_spacings)//2]
-        
-        # Validate grid spacing consistency - print warnings if inconsistent
-        h_std = np.std(horizontal_spacings)
-        v_std = np.std(vertical_spacings)
-        h_mean = np.mean(horizontal_spacings)
-        v_mean = np.mean(vertical_spacings)
-        
-        h_cv = h_std / h_mean if h_mean > 0 else 0
-        v_cv = v_std / v_mean if v_mean > 0 else 0
-        
-        if h_cv > 0.2 or v_cv > 0.2:  # Coefficient of variation > 20% indicates inconsistency
-            print(f"WARNING: Grid spacing is inconsistent. CV: h={h_cv:.2f}, v={v_cv:.2f}")
-            print(f"Horizontal spacings: min={min(horizontal_spacings):.1f}, max={max(horizontal_spacings):.1f}, median={median_h_spacing:.1f}")
-            print(f"Vertical spacings: min={min(vertical_spacings):.1f}, max={max(vertical_spacings):.1f}, median={median_v_spacing:.1f}")
-    else:
+    # Use the median grid spacing as the most reliable grid cell size
+    median_h_spacing = grid['median_h_spacing']
+    median_v_spacing = grid['median_v_spacing']
+    if median_h_spacing is None or median_v_spacing is None:
         # Fallback if spacing calculation fails
-        print("WARNING: Could not calculate reliable grid spacing")
         median_h_spacing = img_rgb.shape[0] / max(1, num_rows)
         median_v_spacing = img_rgb.shape[1] / max(1, num_cols)
     
@@ -226,33 +321,23 @@ def analyze_grid(image_path, paper_width_inches):
     v_scale_bar_x = grid_top_left_x - bar_thickness * 1.5  # Position just left of the grid
     v_scale_bar_y = grid_top_left_y
     
-    # Draw checkered 1cm segments for horizontal scale bar (10 segments of 1cm each)
+    # Checkered 1cm segments for horizontal scale bar (10 segments of 1cm each),
+    # aligned precisely with the grid top edge
     segment_width = grid_unit_width_pixels / 10  # Each segment is 1cm
+    h_segments = [Rectangle((h_scale_bar_x + i * segment_width, h_scale_bar_y), segment_width, bar_thickness)
+                  for i in range(10)]
     
-    for i in range(10):
-        # Alternate colors for checkered pattern
-        color = 'black' if i % 2 == 0 else 'white'
-        edge_color = 'white' if i % 2 == 0 else 'black'
-        
-        # Create one segment at a time, aligned precisely with the grid top edge
-        h_segment = Rectangle((h_scale_bar_x + i * segment_width, h_scale_bar_y), 
-                             segment_width, bar_thickness,
-                             linewidth=2, edgecolor=edge_color, facecolor=color, alpha=1.0)
-        img_ax.add_patch(h_segment)
-    
-    # Draw checkered 1cm segments for vertical scale bar (10 segments of 1cm each)
+    # Checkered 1cm segments for vertical scale bar (10 segments of 1cm each),
+    # aligned precisely with the grid left edge
     segment_height = grid_unit_height_pixels / 10  # Each segment is 1cm
+    v_segments = [Rectangle((v_scale_bar_x, v_scale_bar_y + i * segment_height), bar_thickness, segment_height)
+                  for i in range(10)]
     
-    for i in range(10):
-        # Alternate colors for checkered pattern
-        color = 'black' if i % 2 == 0 else 'white'
-        edge_color = 'white' if i % 2 == 0 else 'black'
-        
-        # Create one segment at a time, aligned precisely with the grid left edge
-        v_segment = Rectangle((v_scale_bar_x, v_scale_bar_y + i * segment_height), 
-                             bar_thickness, segment_height,
-                             linewidth=2, edgecolor=edge_color, facecolor=color, alpha=1.0)
-        img_ax.add_patch(v_segment)
+    # Draw both scale bars as one collection, alternating colors for the checkered pattern
+    colors = ['black' if i % 2 == 0 else 'white' for i in range(10)] * 2
+    edge_colors = ['white' if i % 2 == 0 else 'black' for i in range(10)] * 2
+    img_ax.add_collection(PatchCollection(h_segments + v_segments, facecolors=colors,
+                                          edgecolors=edge_colors, linewidths=2, alpha=1.0))
     
     # Add scale bar labels with larger font size (doubled)
     img_ax.text(h_scale_bar_x + segment_width/2, 
@@ -474,6 +559,24 @@ def analyze_grid(image_path, paper_width_inches):
     
     return pdf_filename
 
+def init_worker():
+    """Limit OpenCV to one thread in each worker process, as the pool already runs one file per core"""
+    cv2.setNumThreads(1)
+
+def process_png(image_path, paper_sizes):
+    """Generate the PDFs of one PNG image for every paper size
+    
+    The grid is detected once and shared by the PDFs of all paper sizes.
+    
+    Returns:
+        List with the PDF filename generated for each paper size, or None
+        where the image could not be processed
+    """
+    grid = detect_grid(image_path)
+    if grid is None:
+        return [None] * len(paper_sizes)
+    return [render_pdf(image_path, grid, paper_size) for paper_size in paper_sizes]
+
 def main():
     # Create output directory
     os.makedirs("PDFs", exist_ok=True)
@@ -490,18 +593,16 @@ def main():
     # Paper sizes to generate (42-inch and 44-inch)
     paper_sizes = [42, 44]
     
-    # Process all files for both paper sizes
-    all_pdf_filenames = []
+    # Process the files in parallel, one worker process per core; each worker
+    # generates the PDFs of a file for all paper sizes
+    print(f"\nGenerating PDFs for {' and '.join(f'{paper_size}-inch' for paper_size in paper_sizes)} paper...")
+    num_workers = min(len(png_files), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=init_worker) as executor:
+        results = list(executor.map(process_png, png_files, [paper_sizes] * len(png_files)))
     
-    for paper_size in paper_sizes:
-        print(f"\nGenerating PDFs for {paper_size}-inch paper...")
-        
-        pdf_filenames = []
-        for png_file in png_files:
-            pdf_name = analyze_grid(png_file, paper_size)
-            if pdf_name:
-                pdf_filenames.append(pdf_name)
-                all_pdf_filenames.append(pdf_name)
+    # List the PDFs by paper size, then by file
+    all_pdf_filenames = [pdf_names[i] for i in range(len(paper_sizes))
+                         for pdf_names in results if pdf_names[i]]
     
     # Print results
     print("\nGenerated PDF files (in 'PDFs' folder):")